@@ -40,7 +40,6 @@ Main modules are:
 * builder contains the class responsible to build astroid trees
 """
 
-import sys
 import re
 from operator import attrgetter
 
@@ -68,6 +67,7 @@ from astroid.nodes import *
 from astroid import inference
 
 # more stuff available
+from astroid import disk_cache
 from astroid import raw_building
 from astroid.bases import Instance, BoundMethod, UnboundMethod
 from astroid.node_classes import are_exclusive, unpack_infer
@@ -104,7 +104,21 @@ class AsStringRegexpPredicate(object):
             node = attrgetter(self.expression)(node)
         return self.regexp.search(node.as_string())
 
-def inference_tip(infer_function):
+def _cached_inference(infer_function):
+    """Wrap the given inference function so that its results are stored in
+    the inference context, as the ones of the default inference are.
+    """
+    def infer(node, context=None, **kwargs):
+        if context is None:
+            return infer_function(node, context, **kwargs)
+        key = (node, context.lookupname, context.callcontext, context.boundnode)
+        if key in context.inferred:
+            return iter(context.inferred[key])
+        return context.cache_generator(key, infer_function(node, context, **kwargs))
+    return infer
+
+
+def inference_tip(infer_function, cached=True):
     """Given an instance specific inference function, return a function to be
     given to MANAGER.register_transform to set this inference function.
 
@@ -114,30 +128,63 @@ def inference_tip(infer_function):
 
        MANAGER.register_transform(Call, inference_tip(infer_named_tuple),
                                   predicate)
+
+    Unless cached is false, the results of the inference function are cached
+    in the inference context, so it should only depend on the node and on the
+    context.
     """
+    if cached:
+        infer_function = _cached_inference(infer_function)
     def transform(node, infer_function=infer_function):
         node._explicit_inference = infer_function
         return node
     return transform
 
 
-def register_module_extender(manager, module_name, get_extension_mod):
+def register_module_extender(manager, module_name, get_extension_mod, cache=True):
+    """Register a transform adding the names defined by the module returned
+    by get_extension_mod to the module of the given name.
+
+    Unless cache is false, the extension module is only built the first time
+    and reused for the trees built later for the module, so
+    get_extension_mod shouldn't then depend on other trees which may be
+    built again. Once the cache of the manager is cleared, the trees get a
+    new copy of the extension module, unpickled from the one first built,
+    without what was inferred from it.
+    """
+    # the extension module given to the trees, and its pickle taken before
+    # anything was inferred from it
+    extension_modules = []
+    pickles = []
+    def forget():
+        del extension_modules[:]
     def transform(node):
-        extension_module = get_extension_mod()
+        if extension_modules:
+            extension_module = extension_modules[0]
+        else:
+            extension_module = None
+            if pickles:
+                extension_module = disk_cache.loads(pickles[0])
+            if extension_module is None:
+                extension_module = get_extension_mod()
+                if cache:
+                    pickled = disk_cache.dumps(extension_module)
+                    if pickled is not None:
+                        pickles.append(pickled)
+            if cache:
+                extension_modules.append(extension_module)
         for name, obj in extension_module.locals.items():
-            node.locals[name] = obj
+            # copy the lists so that the extension module isn't altered
+            # along with the extended one
+            node.locals[name] = list(obj)
 
-    manager.register_transform(Module, transform, lambda n: n.name == module_name)
+    manager.register_transform(Module, transform, key=module_name)
+    if cache:
+        manager.register_clear_cache_hook(forget)
 
 
-# load brain plugins
-from os import listdir
+# load brain plugins, except the ones loaded on demand by the manager
 from os.path import join, dirname
 BRAIN_MODULES_DIR = join(dirname(__file__), 'brain')
-if BRAIN_MODULES_DIR not in sys.path:
-    # add it to the end of the list so user path take precedence
-    sys.path.append(BRAIN_MODULES_DIR)
-# load modules in this directory
-for module in listdir(BRAIN_MODULES_DIR):
-    if module.endswith('.py'):
-        __import__(module[:-3])
+from astroid import brain
+brain.load_eager_plugins()
@@ -18,6 +18,11 @@
 """Small AST optimizations."""
 
 import _ast
+import math
+import operator
+import sys
+
+import six
 
 from astroid import nodes
 
@@ -30,6 +35,94 @@ try:
 except AttributeError:
     _TYPES = (_ast.Str, )
 
+# the values of the constants which may be folded
+_FOLDABLE_TYPES = six.integer_types + (float, complex, six.binary_type, six.text_type)
+_SEQUENCE_TYPES = (six.binary_type, six.text_type)
+# bounds of the size of a folded constant: the length of a string and the
+# number of bits of an integer
+MAX_FOLDED_LENGTH = 4096
+MAX_FOLDED_BITS = 4096
+
+_BIN_OPERATORS = {'+': operator.add,
+                  '-': operator.sub,
+                  '*': operator.mul,
+                  '//': operator.floordiv,
+                  '%': operator.mod,
+                  '**': operator.pow,
+                  '<<': operator.lshift,
+                  '>>': operator.rshift,
+                  '&': operator.and_,
+                  '|': operator.or_,
+                  '^': operator.xor,
+                 }
+if sys.version_info >= (3, 0):
+    # the meaning of / depends on the future imports of the module on
+    # Python 2, which aren't known yet when rebuilding it
+    _BIN_OPERATORS['/'] = operator.truediv
+
+# "is" and "is not" are left out, their result depends on the interpreter
+_CMP_OPERATORS = {'==': operator.eq,
+                  '!=': operator.ne,
+                  '<': operator.lt,
+                  '<=': operator.le,
+                  '>': operator.gt,
+                  '>=': operator.ge,
+                  'in': lambda left, right: left in right,
+                  'not in': lambda left, right: left not in right,
+                 }
+
+_UNARY_OPERATORS = {'+': operator.pos,
+                    '-': operator.neg,
+                    '~': operator.invert,
+                    'not': operator.not_,
+                   }
+
+
+def _constant_value(node):
+    """return the value of the given node if it's a constant which may be
+    folded, else raise TypeError"""
+    if isinstance(node, nodes.Const) and isinstance(node.value, _FOLDABLE_TYPES):
+        return node.value
+    raise TypeError(node)
+
+
+def _check_size(value):
+    """raise ValueError if the given value is too big to be folded"""
+    if isinstance(value, _SEQUENCE_TYPES):
+        if len(value) > MAX_FOLDED_LENGTH:
+            raise ValueError(value)
+    elif isinstance(value, six.integer_types):
+        if value.bit_length() > MAX_FOLDED_BITS:
+            raise ValueError(value)
+
+
+def _is_finite(value):
+    if isinstance(value, complex):
+        return _is_finite(value.real) and _is_finite(value.imag)
+    return not (math.isinf(value) or math.isnan(value))
+
+
+def _check_binop_size(op, left, right):
+    """raise ValueError if the result of the given operation would be too
+    big to be folded, without computing it"""
+    if op == '%' and isinstance(left, _SEQUENCE_TYPES):
+        # string formatting, the width of the fields isn't bounded
+        raise ValueError(left)
+    if op == '*':
+        if isinstance(left, _SEQUENCE_TYPES) and isinstance(right, six.integer_types):
+            if len(left) * right > MAX_FOLDED_LENGTH:
+                raise ValueError(left)
+        elif isinstance(right, _SEQUENCE_TYPES) and isinstance(left, six.integer_types):
+            if len(right) * left > MAX_FOLDED_LENGTH:
+                raise ValueError(right)
+    elif op == '**':
+        if (isinstance(left, six.integer_types) and isinstance(right, six.integer_types)
+                and abs(left) > 1 and right * left.bit_length() > MAX_FOLDED_BITS):
+            raise ValueError(right)
+    elif op == '<<':
+        if isinstance(right, six.integer_types) and right > MAX_FOLDED_BITS:
+            raise ValueError(right)
+
 
 class ASTPeepholeOptimizer(object):
     """Class for applying small optimizations to generate new AST."""
@@ -84,3 +177,106 @@ class ASTPeepholeOptimizer(object):
         value = known().join(reversed(ast_nodes))
         newnode = nodes.Const(value, node.lineno, node.col_offset, parent)
         return newnode
+
+    def _folded(self, value, node):
+        if not isinstance(value, _FOLDABLE_TYPES):
+            return None
+        if isinstance(value, (float, complex)) and not _is_finite(value):
+            # there is no literal for these values
+            return None
+        try:
+            _check_size(value)
+        except ValueError:
+            return None
+        return nodes.Const(value, node.lineno, node.col_offset, node.parent)
+
+    def fold_binop(self, node):
+        """Return a Const node for the given BinOp of constants, or a single
+        list or tuple for the concatenation of two lists or tuples
+
+        Return ``None`` if the operands aren't constants, if the operation
+        fails or if its result would be too big.
+        """
+        if (node.op == '+' and node.left.__class__ in (nodes.List, nodes.Tuple)
+                and node.right.__class__ is node.left.__class__):
+            return self._concatenated(node)
+        try:
+            function = _BIN_OPERATORS[node.op]
+            left = _constant_value(node.left)
+            right = _constant_value(node.right)
+            _check_binop_size(node.op, left, right)
+            value = function(left, right)
+        except Exception: # pylint: disable=broad-except
+            return None
+        return self._folded(value, node)
+
+    @staticmethod
+    def _concatenated(node):
+        """Return the list or tuple made of the elements of the operands of
+        the given concatenation, or ``None`` if it would be too long
+
+        The elements may be any expression. Chains of concatenations are
+        flattened bottom-up, as the operands are built first: the left one,
+        which may be the result of the previous concatenation, is extended.
+        """
+        left, right = node.left, node.right
+        if len(left.elts) + len(right.elts) > MAX_FOLDED_LENGTH:
+            return None
+        for elt in right.elts:
+            elt.parent = left
+        left.elts.extend(right.elts)
+        left.lineno, left.col_offset = node.lineno, node.col_offset
+        left.parent = node.parent
+        return left
+
+    def fold_boolop(self, node):
+        """Return a Const node for the given BoolOp of constants, or ``None``
+
+        The operands which are BoolOps of the same operator are merged into
+        the given node beforehand, since they are built first the chains are
+        flattened bottom-up.
+        """
+        if any(value.__class__ is nodes.BoolOp and value.op == node.op
+               for value in node.values):
+            values = []
+            for value in node.values:
+                if value.__class__ is nodes.BoolOp and value.op == node.op:
+                    values.extend(value.values)
+                else:
+                    values.append(value)
+            for value in values:
+                value.parent = node
+            node.values = values
+        try:
+            values = [_constant_value(value) for value in node.values]
+        except TypeError:
+            return None
+        for value in values[:-1]:
+            if bool(value) == (node.op == 'or'):
+                break
+        else:
+            value = values[-1]
+        return self._folded(value, node)
+
+    def fold_compare(self, node):
+        """Return a Const node for the given Compare of constants, or ``None``"""
+        try:
+            left = _constant_value(node.left)
+            value = True
+            for op, right in node.ops:
+                right = _constant_value(right)
+                if not _CMP_OPERATORS[op](left, right):
+                    value = False
+                    break
+                left = right
+        except Exception: # pylint: disable=broad-except
+            return None
+        return self._folded(value, node)
+
+    def fold_unaryop(self, node):
+        """Return a Const node for the given UnaryOp of a constant, or ``None``"""
+        try:
+            value = _UNARY_OPERATORS[node.op](_constant_value(node.operand))
+        except Exception: # pylint: disable=broad-except
+            return None
+        return self._folded(value, node)
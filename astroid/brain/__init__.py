@@ -0,0 +1,93 @@
+# copyright 2003-2015 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""Brain plugins, helping astroid to understand some modules.
+
+The plugins listed in LAZY_PLUGINS only matter for the modules whose names
+are given with them (or for their submodules). They are imported the first
+time such a module is looked up, built, or imported by a module being built.
+All the other plugins of this package are imported along with astroid.
+"""
+
+import importlib
+import os
+
+# plugin name -> names of the modules the plugin cares about
+LAZY_PLUGINS = {
+    'brain_dateutil': ('dateutil', ),
+    'brain_gi': ('gi', ),
+    'brain_mechanize': ('mechanize', ),
+    'brain_nose': ('nose', ),
+    'brain_numpy': ('numpy', ),
+    'brain_pytest': ('pytest', 'py', '_pytest'),
+    'brain_qt': ('PyQt4', 'PyQt5'),
+    'brain_six': ('six', 'requests.packages.urllib3.packages.six'),
+}
+
+# module name -> plugins still to be imported for it
+_PENDING = {}
+for _plugin, _modnames in LAZY_PLUGINS.items():
+    for _modname in _modnames:
+        _PENDING.setdefault(_modname, []).append(_plugin)
+del _plugin, _modnames, _modname
+
+
+def _import_plugin(name):
+    importlib.import_module('%s.%s' % (__name__, name))
+
+
+def load_eager_plugins():
+    """import the plugins which aren't loaded on demand"""
+    for filename in sorted(os.listdir(os.path.dirname(__file__))):
+        name, ext = os.path.splitext(filename)
+        if ext == '.py' and name != '__init__' and name not in LAZY_PLUGINS:
+            _import_plugin(name)
+
+
+def load_plugins(modname):
+    """import the plugins caring about the given module, if not done yet"""
+    if not _PENDING or not modname:
+        return
+    parts = modname.split('.')
+    for index in range(1, len(parts) + 1):
+        plugins = _PENDING.pop('.'.join(parts[:index]), None)
+        if plugins:
+            for plugin in plugins:
+                _import_plugin(plugin)
+
+
+def load_module_plugins(module):
+    """import the plugins caring about the given module or about the
+    modules it imports
+    """
+    if not _PENDING:
+        return
+    load_plugins(module.name)
+    nodes_by_type = getattr(module, 'nodes_by_type', None)
+    if nodes_by_type is None:
+        return
+    from astroid import node_classes
+    nodes_by_type = nodes_by_type()
+    for node in nodes_by_type.get(node_classes.Import, ()):
+        for name, _ in node.names:
+            load_plugins(name)
+    for node in nodes_by_type.get(node_classes.ImportFrom, ()):
+        if node.level:
+            continue
+        load_plugins(node.modname)
+        for name, _ in node.names:
+            load_plugins('%s.%s' % (node.modname, name))
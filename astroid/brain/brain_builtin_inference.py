@@ -8,6 +8,7 @@ import six
 from astroid import (MANAGER, UseInferenceDefault, AttributeInferenceError,
                      inference_tip, InferenceError, NameInferenceError)
 from astroid import arguments
+from astroid import disk_cache
 from astroid.builder import AstroidBuilder
 from astroid import helpers
 from astroid import nodes
@@ -15,8 +16,18 @@ from astroid import objects
 from astroid import scoped_nodes
 from astroid import util
 
-def _extend_str(class_node, rvalue):
-    """function to extend builtin str/unicode class"""
+# rvalue -> pickled stub class of the methods of str-like classes
+_STR_STUBS = {}
+
+def _str_stub(rvalue):
+    """return a new stub class of the methods of the str-like classes whose
+    methods return the given rvalue
+
+    The stub is only built the first time, and then copied from its pickle.
+    """
+    stub = _STR_STUBS.get(rvalue)
+    if stub is not None:
+        return disk_cache.loads(stub)
     # TODO(cpopa): this approach will make astroid to believe
     # that some arguments can be passed by keyword, but
     # unfortunately, strings and bytes don't accept keyword arguments.
@@ -63,7 +74,12 @@ def _extend_str(class_node, rvalue):
     ''')
     code = code.format(rvalue=rvalue)
     fake = AstroidBuilder(MANAGER).string_build(code)['whatever']
-    for method in fake.mymethods():
+    _STR_STUBS[rvalue] = disk_cache.dumps(fake)
+    return fake
+
+def _extend_str(class_node, rvalue):
+    """function to extend builtin str/unicode class"""
+    for method in _str_stub(rvalue).mymethods():
         class_node.locals[method.name] = [method]
         method.parent = class_node
 
@@ -74,11 +90,20 @@ def extend_builtins(class_transforms):
         transform(builtin_ast[class_name])
 
 if sys.version_info > (3, 0):
-    extend_builtins({'bytes': partial(_extend_str, rvalue="b''"),
-                     'str': partial(_extend_str, rvalue="''")})
+    _STR_CLASSES = {'bytes': "b''", 'str': "''"}
 else:
-    extend_builtins({'str': partial(_extend_str, rvalue="''"),
-                     'unicode': partial(_extend_str, rvalue="u''")})
+    _STR_CLASSES = {'str': "''", 'unicode': "u''"}
+
+def _extend_builtins_module(module):
+    """extend the str-like classes of the builtins module, which is built
+    again after the cache of the manager is cleared"""
+    for class_name, rvalue in _STR_CLASSES.items():
+        for class_node in module.locals.get(class_name, ()):
+            _extend_str(class_node, rvalue)
+
+MANAGER.register_transform(nodes.Module, _extend_builtins_module,
+                           key=six.moves.builtins.__name__)
+_extend_builtins_module(MANAGER.astroid_cache[six.moves.builtins.__name__])
 
 
 def register_builtin_transform(transform, builtin_name):
@@ -102,8 +127,8 @@ def register_builtin_transform(transform, builtin_name):
 
     MANAGER.register_transform(nodes.Call,
                                inference_tip(_transform_wrapper),
-                               lambda n: (isinstance(n.func, nodes.Name) and
-                                          n.func.name == builtin_name))
+                               lambda n: isinstance(n.func, nodes.Name),
+                               key=builtin_name)
 
 
 def _generic_inference(node, context, node_type, transform):
@@ -3,17 +3,22 @@
 Helps with understanding everything imported from 'gi.repository'
 """
 
+import glob
 import inspect
 import itertools
+import os
 import sys
 import re
 import warnings
 
 from astroid import MANAGER, AstroidBuildingError, nodes
+from astroid import disk_cache
 from astroid.builder import AstroidBuilder
 
 
 _inspected_modules = {}
+# namespace -> version given to gi.require_version by the analysed code
+_required_versions = {}
 
 _identifier_re = r'^[A-Za-z_]\w*$'
 
@@ -111,42 +116,101 @@ def _gi_build_stub(parent):
 
     return ret
 
+def _gi_modcode(modname, required_versions=None):
+    """Import the given gi.repository module and return the source code of
+    its stub.
+
+    The given versions of the namespaces are required first, which is
+    needed when this runs in a helper process.
+    """
+    if required_versions:
+        import gi
+        for namespace, version in required_versions.items():
+            try:
+                gi.require_version(namespace, version)
+            except Exception:
+                pass
+
+    modnames = [modname]
+    optional_modnames = []
+
+    # GLib and GObject may have some special case handling
+    # in pygobject that we need to cope with. However at
+    # least as of pygobject3-3.13.91 the _glib module doesn't
+    # exist anymore, so if treat these modules as optional.
+    if modname == 'gi.repository.GLib':
+        optional_modnames.append('gi._glib')
+    elif modname == 'gi.repository.GObject':
+        optional_modnames.append('gi._gobject')
+
+    modcode = ''
+    for m in itertools.chain(modnames, optional_modnames):
+        try:
+            __import__(m)
+            with warnings.catch_warnings():
+                # Just inspecting the code can raise gi deprecation
+                # warnings, so ignore them.
+                try:
+                    from gi import PyGIDeprecationWarning
+                    warnings.simplefilter("ignore", PyGIDeprecationWarning)
+                except Exception:
+                    pass
+
+                modcode += _gi_build_stub(sys.modules[m])
+        except ImportError:
+            if m not in optional_modnames:
+                raise
+    return modcode
+
+def _typelib_directories():
+    """Return the directories where the typelib files may be found."""
+    directories = [directory for directory
+                   in os.environ.get('GI_TYPELIB_PATH', '').split(os.pathsep)
+                   if directory]
+    for prefix in sorted(set((sys.prefix, sys.exec_prefix, '/usr'))):
+        directories.extend(glob.glob(os.path.join(prefix, 'lib*', 'girepository-1.0')))
+        directories.extend(glob.glob(os.path.join(prefix, 'lib*', '*', 'girepository-1.0')))
+    return directories
+
+def _stub_cache_key(modname):
+    """Return the key of the stub of the given module in the on-disk cache.
+
+    The stub depends on the required version of its namespace and on the
+    typelib files describing it, None is returned when there is no such
+    file to check it against.
+    """
+    if disk_cache.cache_directory() is None:
+        return None
+    namespace = modname.split('.')[2]
+    version = _required_versions.get(namespace)
+    pattern = '%s-%s.typelib' % (namespace, version or '*')
+    typelibs = set()
+    for directory in _typelib_directories():
+        typelibs.update(glob.glob(os.path.join(directory, pattern)))
+    if not typelibs:
+        return None
+    return (modname, version,
+            [(path, os.path.getmtime(path)) for path in sorted(typelibs)])
+
 def _import_gi_module(modname):
     # we only consider gi.repository submodules
     if not modname.startswith('gi.repository.'):
         raise AstroidBuildingError(modname=modname)
     # build astroid representation unless we already tried so
     if modname not in _inspected_modules:
-        modnames = [modname]
-        optional_modnames = []
-
-        # GLib and GObject may have some special case handling
-        # in pygobject that we need to cope with. However at
-        # least as of pygobject3-3.13.91 the _glib module doesn't
-        # exist anymore, so if treat these modules as optional.
-        if modname == 'gi.repository.GLib':
-            optional_modnames.append('gi._glib')
-        elif modname == 'gi.repository.GObject':
-            optional_modnames.append('gi._gobject')
-
+        key = _stub_cache_key(modname)
+        modcode = None
+        if key is not None:
+            modcode = disk_cache.load('gi', key)
         try:
-            modcode = ''
-            for m in itertools.chain(modnames, optional_modnames):
-                try:
-                    __import__(m)
-                    with warnings.catch_warnings():
-                        # Just inspecting the code can raise gi deprecation
-                        # warnings, so ignore them.
-                        try:
-                            from gi import PyGIDeprecationWarning
-                            warnings.simplefilter("ignore", PyGIDeprecationWarning)
-                        except Exception:
-                            pass
-
-                        modcode += _gi_build_stub(sys.modules[m])
-                except ImportError:
-                    if m not in optional_modnames:
-                        raise
+            if modcode is None:
+                if MANAGER.introspection_processes:
+                    modcode = MANAGER.introspection_pool().apply(
+                        _gi_modcode, modname, _required_versions)
+                else:
+                    modcode = _gi_modcode(modname)
+                if key is not None:
+                    disk_cache.store('gi', key, modcode)
         except ImportError:
             astng = _inspected_modules[modname] = None
         else:
@@ -182,14 +246,20 @@ def _looks_like_require_version(node):
     return False
 
 def _register_require_version(node):
+    namespace, version = node.args[0].value, node.args[1].value
+    _required_versions[namespace] = version
+    if MANAGER.introspection_processes:
+        # the version is required by the helper processes
+        return node
     # Load the gi.require_version locally
     try:
         import gi
-        gi.require_version(node.args[0].value, node.args[1].value)
+        gi.require_version(namespace, version)
     except Exception:
         pass
 
     return node
 
 MANAGER.register_failed_import_hook(_import_gi_module)
-MANAGER.register_transform(nodes.Call, _register_require_version, _looks_like_require_version)
+MANAGER.register_transform(nodes.Call, _register_require_version, _looks_like_require_version,
+                           key='require_version')
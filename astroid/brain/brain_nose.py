@@ -76,7 +76,8 @@ def _nose_tools_trivial_transform():
     return stub
 
 
+# the stub is made of the methods of the unittest tree, don't keep it
 astroid.register_module_extender(astroid.MANAGER, 'nose.tools.trivial',
-                                 _nose_tools_trivial_transform)
+                                 _nose_tools_trivial_transform, cache=False)
 astroid.MANAGER.register_transform(astroid.Module, _nose_tools_transform,
-                                   lambda n: n.name == 'nose.tools')
+                                   key='nose.tools')
@@ -13,17 +13,24 @@ def _looks_like_signal(node, signal_name='pyqtSignal'):
     return False
 
 
-def transform_pyqt_signal(node):    
-    module = parse('''
-    class pyqtSignal(object):
-        def connect(self, slot, type=None, no_receiver_check=False):
-            pass
-        def disconnect(self, slot):
-            pass
-        def emit(self, *args):
-            pass
-    ''')
-    signal_cls = module['pyqtSignal']
+_SIGNAL_MODULE = []
+
+def _signal_class():
+    if not _SIGNAL_MODULE:
+        _SIGNAL_MODULE.append(parse('''
+        class pyqtSignal(object):
+            def connect(self, slot, type=None, no_receiver_check=False):
+                pass
+            def disconnect(self, slot):
+                pass
+            def emit(self, *args):
+                pass
+        '''))
+    return _SIGNAL_MODULE[0]['pyqtSignal']
+
+
+def transform_pyqt_signal(node):
+    signal_cls = _signal_class()
     node.instance_attrs['emit'] = signal_cls['emit']
     node.instance_attrs['disconnect'] = signal_cls['disconnect']
     node.instance_attrs['connect'] = signal_cls['connect']
@@ -1,5 +1,6 @@
 """Astroid hooks for the Python standard library."""
 
+import collections
 import functools
 import sys
 from textwrap import dedent
@@ -73,6 +74,17 @@ def infer_func_form(node, base_type, context=None, enum=False):
                     raise AttributeError
     except (AttributeError, exceptions.InferenceError):
         raise UseInferenceDefault()
+    # the same class is returned every time the call is inferred with the
+    # same arguments: {(name, attributes, base type): synthesized class} is
+    # kept on the call node, so that it goes away along with its tree
+    classes = node.__dict__.setdefault('_synthesized', {})
+    key = (name, tuple(attributes), base_type)
+    if key not in classes:
+        classes[key] = _build_func_form(node, base_type, name, attributes)
+    return classes[key], name, attributes
+
+
+def _build_func_form(node, base_type, name, attributes):
     # we want to return a Class node instance with proper attributes set
     class_node = nodes.ClassDef(name, 'docstring')
     class_node.parent = node.parent
@@ -84,7 +96,7 @@ def infer_func_form(node, base_type, context=None, enum=False):
         fake_node.parent = class_node
         fake_node.attrname = attr
         class_node.instance_attrs[attr] = [fake_node]
-    return class_node, name, attributes
+    return class_node
 
 
 # module specific transformation functions #####################################
@@ -265,11 +277,19 @@ _looks_like_namedtuple = functools.partial(_looks_like, name='namedtuple')
 _looks_like_enum = functools.partial(_looks_like, name='Enum')
 
 
-def infer_named_tuple(node, context=None):
-    """Specific inference function for namedtuple Call node"""
-    class_node, name, attributes = infer_func_form(node, nodes.Tuple._proxied,
-                                                   context=context)
-    fake = AstroidBuilder(MANAGER).string_build('''
+# the number of classes built from the namedtuple template which are kept,
+# the least recently used one being dropped first
+MAX_NAMEDTUPLE_TEMPLATES = 128
+# (name, attributes) -> class built from the namedtuple template, the most
+# recently used last
+_NAMEDTUPLE_TEMPLATES = collections.OrderedDict()
+MANAGER.register_clear_cache_hook(_NAMEDTUPLE_TEMPLATES.clear)
+
+def _namedtuple_template(name, attributes):
+    key = (name, tuple(attributes))
+    template = _NAMEDTUPLE_TEMPLATES.pop(key, None)
+    if template is None:
+        fake = AstroidBuilder(MANAGER).string_build('''
 class %(name)s(tuple):
     _fields = %(fields)r
     def _asdict(self):
@@ -280,18 +300,30 @@ class %(name)s(tuple):
     def _replace(self, **kwds):
         return self
     ''' % {'name': name, 'fields': attributes})
-    class_node.locals['_asdict'] = fake.body[0].locals['_asdict']
-    class_node.locals['_make'] = fake.body[0].locals['_make']
-    class_node.locals['_replace'] = fake.body[0].locals['_replace']
-    class_node.locals['_fields'] = fake.body[0].locals['_fields']
+        template = fake.body[0]
+        while len(_NAMEDTUPLE_TEMPLATES) >= MAX_NAMEDTUPLE_TEMPLATES:
+            _NAMEDTUPLE_TEMPLATES.popitem(last=False)
+    _NAMEDTUPLE_TEMPLATES[key] = template
+    return template
+
+
+def infer_named_tuple(node, context=None):
+    """Specific inference function for namedtuple Call node"""
+    class_node, name, attributes = infer_func_form(node, nodes.Tuple._proxied,
+                                                   context=context)
+    if '_fields' not in class_node.locals:
+        fake = _namedtuple_template(name, attributes)
+        for method in ('_asdict', '_make', '_replace', '_fields'):
+            class_node.locals[method] = fake.locals[method]
     # we use UseInferenceDefault, we can't be a generator so return an iterator
     return iter([class_node])
 
 
+_ENUM_META = nodes.ClassDef("EnumMeta", 'docstring')
+
 def infer_enum(node, context=None):
     """ Specific inference function for enum Call node. """
-    enum_meta = nodes.ClassDef("EnumMeta", 'docstring')
-    class_node = infer_func_form(node, enum_meta,
+    class_node = infer_func_form(node, _ENUM_META,
                                  context=context, enum=True)[0]
     return iter([class_node])
 
@@ -426,9 +458,9 @@ def multiprocessing_managers_transform():
 
 
 MANAGER.register_transform(nodes.Call, inference_tip(infer_named_tuple),
-                           _looks_like_namedtuple)
+                           _looks_like_namedtuple, key='namedtuple')
 MANAGER.register_transform(nodes.Call, inference_tip(infer_enum),
-                           _looks_like_enum)
+                           _looks_like_enum, key='Enum')
 MANAGER.register_transform(nodes.ClassDef, infer_enum_class)
 register_module_extender(MANAGER, 'hashlib', hashlib_transform)
 register_module_extender(MANAGER, 'collections', collections_transform)
@@ -436,4 +468,6 @@ register_module_extender(MANAGER, 'pkg_resources', pkg_resources_transform)
 register_module_extender(MANAGER, 'subprocess', subprocess_transform)
 register_module_extender(MANAGER, 'multiprocessing.managers',
                          multiprocessing_managers_transform)
-register_module_extender(MANAGER, 'multiprocessing', multiprocessing_transform)
+# the multiprocessing extension is made of nodes inferred from other modules
+register_module_extender(MANAGER, 'multiprocessing', multiprocessing_transform,
+                         cache=False)
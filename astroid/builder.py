@@ -22,6 +22,8 @@ at the same time.
 """
 
 import _ast
+import collections
+import io
 import os
 import sys
 import textwrap
@@ -30,6 +32,7 @@ from astroid import bases
 from astroid import exceptions
 from astroid import manager
 from astroid import modutils
+from astroid import nodes
 from astroid import raw_building
 from astroid import rebuilder
 from astroid import util
@@ -39,10 +42,22 @@ def _parse(string):
     return compile(string, "<string>", 'exec', _ast.PyCF_ONLY_AST)
 
 
+def _universal_newlines(data):
+    """translate the Windows and old Mac end of lines of the given source"""
+    return data.replace('\r\n', '\n').replace('\r', '\n')
+
+
 if sys.version_info >= (3, 0):
     # pylint: disable=no-name-in-module; We don't understand flows yet.
     from tokenize import detect_encoding
 
+    def _source_encoding(file_bytes):
+        """get the encoding of the given source bytes"""
+        return detect_encoding(io.BytesIO(file_bytes).readline)[0]
+
+    def _decode_source(file_bytes, encoding):
+        return _universal_newlines(file_bytes.decode(encoding))
+
     def open_source_file(filename):
         with open(filename, 'rb') as byte_stream:
             encoding = detect_encoding(byte_stream.readline)[0]
@@ -66,6 +81,13 @@ else:
             if match is not None:
                 return match.group(1)
 
+    def _source_encoding(file_bytes):
+        """get the encoding of the given source bytes"""
+        return _guess_encoding(_universal_newlines(file_bytes))
+
+    def _decode_source(file_bytes, encoding): # pylint: disable=unused-argument
+        return _universal_newlines(file_bytes)
+
     def open_source_file(filename):
         """get data for parsing a file"""
         stream = open(filename, 'U')
@@ -74,6 +96,135 @@ else:
         return stream, encoding, data
 
 
+def _read_file(filename):
+    with open(filename, 'rb') as stream:
+        return stream.read()
+
+
+def _drop_docstrings(module):
+    """throw away the docstrings of the given module tree"""
+    module.doc = None
+    for node in module.nodes_of_class((nodes.ClassDef, nodes.FunctionDef)):
+        node.doc = None
+
+
+# cached properties of the nodes depending on their line numbers, and on
+# the inference of the rest of the module
+_LINE_PROPERTIES = ('blockstart_tolineno', )
+_INFERENCE_PROPERTIES = ('__cache', '_synthesized', 'type', 'extra_decorators')
+# what a class found from its ancestors, which may have changed. The
+# python 3 rebuilder tells that every class is new style.
+if sys.version_info >= (3, 0):
+    _CLASS_INFERENCE_PROPERTIES = ('_type', )
+else:
+    _CLASS_INFERENCE_PROPERTIES = ('_type', '_newstyle')
+
+
+def _first_line(node, decorators):
+    """return the line where the given top-level statement starts, taking
+    its decorators into account"""
+    return min([node.lineno] + [decorator.lineno for decorator in decorators])
+
+
+def _segments(lines, starts):
+    """return the source text of the top-level statements starting at the
+    given lines, each one running up to the next one"""
+    ends = starts[1:] + [len(lines) + 1]
+    return ['\n'.join(lines[start - 1:end - 1]) for start, end in zip(starts, ends)]
+
+
+def _reusable_definitions(previous, data, tree):
+    """map the top-level function and class definitions of the given _ast
+    tree, built from *data*, to the ones of the previous module having the
+    same source text
+
+    Definitions declaring global names are always rebuilt since they add
+    names to the module, and everything is when the future imports, which
+    may change how the definitions are parsed, aren't the same.
+    """
+    future_imports = set(alias.name for node in tree.body
+                         if isinstance(node, _ast.ImportFrom)
+                         and node.module == '__future__'
+                         for alias in node.names)
+    old_body = previous.body
+    if (future_imports != previous.future_imports
+            or any(node.lineno is None for node in old_body)):
+        return {}
+    old_starts = [_first_line(node, node.decorators.nodes
+                              if getattr(node, 'decorators', None) else ())
+                  for node in old_body]
+    old_lines = _decode_source(previous.file_bytes, previous.file_encoding).splitlines()
+    candidates = collections.defaultdict(list)
+    for node, start, text in zip(old_body, old_starts,
+                                 _segments(old_lines, old_starts)):
+        if (isinstance(node, (nodes.FunctionDef, nodes.ClassDef))
+                and node.parent is previous
+                and next(node.nodes_of_class(nodes.Global), None) is None):
+            candidates[text].append((node, start))
+    if not candidates:
+        return {}
+    new_body = tree.body
+    new_starts = [_first_line(node, getattr(node, 'decorator_list', ()))
+                  for node in new_body]
+    reused = {}
+    for node, start, text in zip(new_body, new_starts,
+                                 _segments(data.splitlines(), new_starts)):
+        # a statement with the same source text as a definition is the same
+        # definition
+        matching = candidates.get(text)
+        if not matching:
+            continue
+        old_node, old_start = matching.pop(0)
+        _prepare_reuse(old_node, start - old_start)
+        reused[node] = old_node
+    return reused
+
+
+def _prepare_reuse(node, delta):
+    """shift the line numbers of the given reused subtree by *delta* and
+    forget what was inferred or found by inference from the previous tree
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        cached = node.__dict__
+        for name in _INFERENCE_PROPERTIES:
+            cached.pop(name, None)
+        if isinstance(node, nodes.ClassDef):
+            for name in _CLASS_INFERENCE_PROPERTIES:
+                cached.pop(name, None)
+            if cached.pop('_metaclass_hack', False):
+                # the metaclass was taken from a base class made up by
+                # with_metaclass, see ClassDef.declared_metaclass
+                cached.pop('_metaclass', None)
+        if 'instance_attrs' in cached:
+            # these are set by the delayed assignments to attributes,
+            # which are handled again on the new tree
+            node.instance_attrs = {}
+            for name, values in list(node.locals.items()):
+                values = [value for value in values
+                          if not isinstance(value, nodes.AssignAttr)]
+                if values:
+                    node.locals[name] = values
+                else:
+                    del node.locals[name]
+        if delta:
+            if node.lineno is not None:
+                node.lineno += delta
+            for name in _LINE_PROPERTIES:
+                cached.pop(name, None)
+        if '_constants' in cached:
+            # the elements of a large literal container aren't built yet,
+            # their line numbers are every third item of the constants
+            if delta:
+                node._constants = [
+                    tuple(item + delta if index % 3 == 1 else item
+                          for index, item in enumerate(constant))
+                    for constant in node._constants]
+            continue
+        stack.extend(node.get_children())
+
+
 MANAGER = manager.AstroidManager()
 
 
@@ -110,13 +261,21 @@ class AstroidBuilder(raw_building.InspectBuilder):
                 node = self._manager.visit_transforms(node)
         return node
 
+    def _members_built(self, node):
+        if self._apply_transforms:
+            self._manager.visit_children_transforms(node)
+
     def file_build(self, path, modname=None):
         """Build astroid from a source code file (i.e. from an ast)
 
         *path* is expected to be a python source file
         """
+        encoding = None
         try:
-            stream, encoding, data = open_source_file(path)
+            # the file is only read once, its bytes are kept on the module
+            file_bytes = _read_file(path)
+            encoding = _source_encoding(file_bytes)
+            data = _decode_source(file_bytes, encoding)
         except IOError as exc:
             util.reraise(exceptions.AstroidBuildingError(
                 'Unable to load file {path}:\n{error}',
@@ -129,25 +288,58 @@ class AstroidBuilder(raw_building.InspectBuilder):
             # detect_encoding returns utf-8 if no encoding specified
             util.reraise(exceptions.AstroidBuildingError(
                 'Wrong ({encoding}) or no encoding specified for {filename}.',
-                encoding=encoding, filename=filename))
-        with stream:
-            # get module name if necessary
-            if modname is None:
-                try:
-                    modname = '.'.join(modutils.modpath_from_file(path))
-                except ImportError:
-                    modname = os.path.splitext(os.path.basename(path))[0]
-            # build astroid representation
-            module = self._data_build(data, modname, path)
-            return self._post_build(module, encoding)
+                encoding=encoding, filename=path))
+        # get module name if necessary
+        if modname is None:
+            try:
+                modname = '.'.join(modutils.modpath_from_file(path))
+            except ImportError:
+                modname = os.path.splitext(os.path.basename(path))[0]
+        # build astroid representation
+        module = self._data_build(data, modname, path)
+        if self._manager.retention_policy(module.name).source != manager.OMIT:
+            module.file_bytes = file_bytes
+        return self._post_build(module, encoding)
 
     def string_build(self, data, modname='', path=None):
         """Build astroid from source code string."""
         module = self._data_build(data, modname, path)
-        module.file_bytes = data.encode('utf-8')
+        if self._manager.retention_policy(module.name).source != manager.OMIT:
+            module.file_bytes = data.encode('utf-8')
         return self._post_build(module, 'utf-8')
 
-    def _post_build(self, module, encoding):
+    def incremental_build(self, previous, data):
+        """Build astroid from the new source code string of a module
+        previously built from source
+
+        The top-level function and class definitions whose source text
+        didn't change aren't rebuilt nor transformed again: the nodes of the
+        previous module are moved to the new one, with their line numbers
+        shifted if needed, and keep the cached properties not depending on
+        the rest of the module. The previous module shouldn't be used
+        anymore. Everything is rebuilt if its source wasn't kept.
+        """
+        path = previous.file if previous.file != '<?>' else None
+        tree = self._parse_data(data, previous.name, path)
+        reused = {}
+        if previous.file_bytes is not None:
+            reused = _reusable_definitions(previous, data, tree)
+        module = self._rebuild(tree, previous.name, path, reused)
+        if self._manager.retention_policy(module.name).source != manager.OMIT:
+            module.file_bytes = data.encode('utf-8')
+        reused = list(reused.values())
+        if reused:
+            # assignments to attributes in the reused definitions may be
+            # about the rebuilt parts of the module, and conversely
+            delayed = module._delayed_assattr
+            for node in reused:
+                delayed.extend(node.nodes_of_class(nodes.AssignAttr))
+            delayed.sort(key=module.node_index().positions.get)
+        if self._manager.astroid_cache.get(module.name) is previous:
+            del self._manager.astroid_cache[module.name]
+        return self._post_build(module, 'utf-8', reused)
+
+    def _post_build(self, module, encoding, reused=()):
         """Handles encoding and delayed nodes after a module has been built"""
         module.file_encoding = encoding
         self._manager.cache_module(module)
@@ -163,17 +355,31 @@ class AstroidBuilder(raw_building.InspectBuilder):
 
         # Visit the transforms
         if self._apply_transforms:
-            module = self._manager.visit_transforms(module)
+            module = self._manager.visit_transforms(module, skip=reused)
+        policy = self._manager.retention_policy(module.name)
+        if policy.source == manager.DROP:
+            module.file_bytes = None
+        if policy.docstrings == manager.DROP:
+            _drop_docstrings(module)
         return module
 
     def _data_build(self, data, modname, path):
         """Build tree node from data and add some informations"""
+        node = self._parse_data(data, modname, path)
+        return self._rebuild(node, modname, path)
+
+    @staticmethod
+    def _parse_data(data, modname, path):
+        """Parse the given source code string to an _ast tree"""
         try:
-            node = _parse(data + '\n')
+            return _parse(data + '\n')
         except (TypeError, ValueError, SyntaxError) as exc:
             util.reraise(exceptions.AstroidSyntaxError(
                 'Parsing Python code failed:\n{error}',
                 source=data, modname=modname, path=path, error=exc))
+
+    def _rebuild(self, node, modname, path, reused=None):
+        """Build tree node from the given _ast tree"""
         if path is not None:
             node_file = os.path.abspath(path)
         else:
@@ -184,7 +390,7 @@ class AstroidBuilder(raw_building.InspectBuilder):
         else:
             package = path and path.find('__init__.py') > -1 or False
         builder = rebuilder.TreeRebuilder(self._manager)
-        module = builder.visit_module(node, modname, node_file, package)
+        module = builder.visit_module(node, modname, node_file, package, reused)
         module._import_from_nodes = builder._import_from_nodes
         module._delayed_assattr = builder._delayed_assattr
         return module
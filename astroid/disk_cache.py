@@ -0,0 +1,116 @@
+# copyright 2003-2015 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""On-disk cache of pickled data which is costly to compute, such as the
+trees built by introspecting living modules.
+
+The cache is disabled unless the ASTROID_CACHE_DIR environment variable gives
+the directory where it should be stored. Entries are stored by namespace and
+by key, the key being hashed along with the versions of astroid and of the
+interpreter, so that an entry is never read by another version.
+"""
+
+import hashlib
+import logging
+import os
+import platform
+import sys
+import tempfile
+
+from six.moves import cPickle as pickle
+
+from astroid import __pkginfo__
+
+
+ENVIRONMENT_VARIABLE = 'ASTROID_CACHE_DIR'
+VERSION = (__pkginfo__.version, platform.python_implementation(), sys.hexversion)
+_LOG = logging.getLogger(__name__)
+# os.rename doesn't overwrite an existing file on Windows
+_replace = getattr(os, 'replace', os.rename)
+
+
+def cache_directory():
+    """return the directory of the cache, or None if it's disabled"""
+    return os.environ.get(ENVIRONMENT_VARIABLE) or None
+
+
+def _entry_path(directory, namespace, key):
+    digest = hashlib.sha1(repr((VERSION, key)).encode('utf-8')).hexdigest()
+    return os.path.join(directory, namespace, digest + '.pickle')
+
+
+def dumps(obj):
+    """pickle the given object, returning None if it can't be pickled"""
+    try:
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    except Exception: # pylint: disable=broad-except
+        _LOG.debug('unable to pickle %r', obj, exc_info=True)
+        return None
+
+
+def loads(data):
+    """unpickle the given data, returning None if it can't be unpickled"""
+    try:
+        return pickle.loads(data)
+    except Exception: # pylint: disable=broad-except
+        _LOG.debug('unable to unpickle cached data', exc_info=True)
+        return None
+
+
+def read(namespace, key):
+    """return the data stored for the given key, or None"""
+    directory = cache_directory()
+    if directory is None:
+        return None
+    try:
+        with open(_entry_path(directory, namespace, key), 'rb') as stream:
+            return stream.read()
+    except (IOError, OSError):
+        return None
+
+
+def write(namespace, key, data):
+    """store the given data for the given key, if the cache is enabled"""
+    directory = cache_directory()
+    if directory is None or data is None:
+        return
+    path = _entry_path(directory, namespace, key)
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        # write to a temporary file first, so that concurrent readers never
+        # see a partial entry
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(descriptor, 'wb') as stream:
+            stream.write(data)
+        _replace(temporary, path)
+    except (IOError, OSError):
+        _LOG.debug('unable to write cache entry %s', path, exc_info=True)
+
+
+def load(namespace, key):
+    """return the object stored for the given key, or None"""
+    data = read(namespace, key)
+    if data is None:
+        return None
+    return loads(data)
+
+
+def store(namespace, key, obj):
+    """store the given object for the given key, if the cache is enabled"""
+    if cache_directory() is not None:
+        write(namespace, key, dumps(obj))
@@ -0,0 +1,260 @@
+# copyright 2003-2015 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""Control flow graph and reaching definitions for function and module frames.
+
+The graph is built at the statement level: every simple statement is a
+point of the graph, while compound statements get a point for each of their
+headers (the test of an if or of a while, the iterable and the target of a
+for loop, the items of a with statement). Definitions of a name made by a
+point are visible from the points following it, but not from the point
+itself, so that ``x = x + 1`` still resolves ``x`` to the previous
+assignment.
+
+The reaching definitions of all the names of the frame are solved at once,
+each definition being a bit of the sets flowing through the graph.
+"""
+
+from astroid import node_classes
+
+
+# the number of points of a graph times the number of definitions of its
+# frame above which the definitions aren't solved, the lookups falling back
+# on the line numbers of the statements
+MAX_SOLVED_SIZE = 2 ** 24
+
+
+class ControlFlowGraph(object):
+    """Statement level control flow graph of a function or of a module.
+
+    The graph is built once for the given frame, along with the definitions
+    reaching each of its points.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        # node -> point, for statements and for the headers of compound ones
+        self._points = {}
+        # point -> list of predecessor points, the point 0 being the entry
+        self._preds = []
+        # stack of the enclosing loops and try / finally statements
+        self._context = []
+        entry = self._new_point(())
+        self._build_block(frame.body, [entry])
+        self._context = None
+        self._reachable = self._compute_reachable()
+        # name -> {definition: bit}, for the names which can be solved, and
+        # point -> bits of the definitions reaching it
+        self._bits, self._ins = self._solve()
+
+    def _new_point(self, preds, *nodes):
+        point = len(self._preds)
+        self._preds.append(list(preds))
+        for node in nodes:
+            if node is not None:
+                self._points[node] = point
+        return point
+
+    def _jump(self, kind, point):
+        """record a break or a continue statement
+
+        A jump crossing a finally block is resumed from the end of that
+        block, once it has been built.
+        """
+        for is_loop, jumps in reversed(self._context):
+            if is_loop:
+                jumps[kind].append(point)
+            else:
+                jumps.add(kind)
+            return
+
+    def _build_block(self, statements, preds):
+        for statement in statements:
+            preds = self._build_statement(statement, preds)
+        return preds
+
+    def _build_loop(self, statement, head, start):
+        jumps = {'break': [], 'continue': []}
+        self._context.append((True, jumps))
+        body = self._build_block(statement.body, [start])
+        self._context.pop()
+        self._preds[head].extend(body + jumps['continue'])
+        return self._build_block(statement.orelse, [head]) + jumps['break']
+
+    def _build_statement(self, statement, preds):
+        # pylint: disable=too-many-return-statements
+        if isinstance(statement, node_classes.If):
+            test = self._new_point(preds, statement, statement.test)
+            return (self._build_block(statement.body, [test])
+                    + self._build_block(statement.orelse, [test]))
+        if isinstance(statement, node_classes.While):
+            test = self._new_point(preds, statement, statement.test)
+            return self._build_loop(statement, test, test)
+        if isinstance(statement, node_classes.For):
+            iterated = self._new_point(preds, statement.iter)
+            # the target is only assigned when the iteration goes on
+            head = self._new_point([iterated])
+            target = self._new_point([head], statement, statement.target)
+            return self._build_loop(statement, head, target)
+        if isinstance(statement, node_classes.With):
+            for expr, variables in statement.items:
+                preds = [self._new_point(preds, expr, variables)]
+            self._points[statement] = preds[0]
+            return self._build_block(statement.body, preds)
+        if isinstance(statement, node_classes.TryExcept):
+            start = len(self._preds)
+            body = self._build_block(statement.body, preds)
+            # an exception may be raised from anywhere in the body
+            raising = preds + list(range(start, len(self._preds)))
+            exits = self._build_block(statement.orelse, body)
+            for handler in statement.handlers:
+                point = self._new_point(raising, handler)
+                exits += self._build_block(handler.body, [point])
+            return exits
+        if isinstance(statement, node_classes.TryFinally):
+            start = len(self._preds)
+            jumps = set()
+            self._context.append((False, jumps))
+            body = self._build_block(statement.body, preds)
+            self._context.pop()
+            entry = self._new_point(body + preds + list(range(start, len(self._preds))))
+            exits = self._build_block(statement.finalbody, [entry])
+            for kind in jumps:
+                for point in exits:
+                    self._jump(kind, point)
+            return exits
+        point = self._new_point(preds, statement)
+        if isinstance(statement, node_classes.Break):
+            self._jump('break', point)
+            return []
+        if isinstance(statement, node_classes.Continue):
+            self._jump('continue', point)
+            return []
+        if isinstance(statement, (node_classes.Return, node_classes.Raise)):
+            return []
+        return [point]
+
+    def _compute_reachable(self):
+        succs = [[] for _ in self._preds]
+        for point, preds in enumerate(self._preds):
+            for pred in preds:
+                succs[pred].append(point)
+        reachable = set([0])
+        stack = [0]
+        while stack:
+            for succ in succs[stack.pop()]:
+                if succ not in reachable:
+                    reachable.add(succ)
+                    stack.append(succ)
+        return reachable
+
+    def point_of(self, node):
+        """return the point of the graph where the given node is evaluated,
+        or None if the node is not part of the graph
+        """
+        statement = node.statement()
+        if statement is self.frame:
+            # arguments are defined when entering the function
+            return 0
+        if node is not statement:
+            while node.parent is not statement:
+                node = node.parent
+            point = self._points.get(node)
+            if point is not None:
+                return point
+        return self._points.get(statement)
+
+    def _definition_points(self, definitions):
+        """return the points of the given definitions of a name, or None if
+        some of them aren't part of the graph"""
+        points = []
+        for definition in definitions:
+            point = self.point_of(definition)
+            if point is None:
+                return None
+            if isinstance(definition.assign_type(), node_classes.Comprehension):
+                # python 2 list comprehensions leak their variables to the
+                # enclosing frame, inside the statement defining them
+                return None
+            points.append(point)
+        return points
+
+    def _solve(self):
+        preds = self._preds
+        count = sum(len(definitions) for definitions in self.frame.locals.values())
+        if len(preds) * count > MAX_SOLVED_SIZE:
+            return {}, None
+        bits = {}
+        # point -> bits of the definitions made by the point, and of all the
+        # definitions of the names it defines
+        gens = {}
+        kills = {}
+        bit = 0
+        for name, definitions in self.frame.locals.items():
+            points = self._definition_points(definitions)
+            if points is None:
+                continue
+            start = bit
+            bits[name] = name_bits = {}
+            for definition, point in zip(definitions, points):
+                name_bits[definition] = bit
+                gens[point] = gens.get(point, 0) | (1 << bit)
+                bit += 1
+            mask = (1 << bit) - (1 << start)
+            for point in set(points):
+                kills[point] = kills.get(point, 0) | mask
+        ins = [0] * len(preds)
+        outs = [0] * len(preds)
+        changed = True
+        while changed:
+            changed = False
+            for point, point_preds in enumerate(preds):
+                mask = 0
+                for pred in point_preds:
+                    mask |= outs[pred]
+                ins[point] = mask
+                kill = kills.get(point)
+                if kill is not None:
+                    mask = mask & ~kill | gens[point]
+                if mask != outs[point]:
+                    outs[point] = mask
+                    changed = True
+        return bits, ins
+
+    def reaching_definitions(self, node, definitions):
+        """return the definitions of the name used by the given node which
+        may reach it, in the order of the given definitions
+
+        None is returned when the graph can't answer, in which case the
+        caller should fall back on another strategy.
+        """
+        point = self.point_of(node)
+        if point is None or point not in self._reachable:
+            return None
+        name_bits = self._bits.get(node.name)
+        if name_bits is None:
+            return None
+        mask = self._ins[point]
+        reaching = []
+        for definition in definitions:
+            bit = name_bits.get(definition)
+            if bit is None:
+                # defined after the graph was built
+                return None
+            if mask >> bit & 1 and not isinstance(definition, node_classes.DelName):
+                reaching.append(definition)
+        return reaching
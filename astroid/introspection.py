@@ -0,0 +1,115 @@
+# copyright 2003-2015 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""Introspection of living modules in helper processes.
+
+Building the tree of a compiled module requires importing it, which may be
+slow, have side effects and leave large native libraries loaded. The
+helper processes of an IntrospectionPool import and introspect the modules
+instead, and send back the pickled trees, which are built without applying
+the transforms. A helper which doesn't answer in time, because it crashed
+or hangs, is taken as a failed import.
+"""
+
+import multiprocessing
+
+from astroid import disk_cache
+
+
+class IntrospectionTimeout(ImportError):
+    """raised when a helper process didn't answer in time"""
+
+
+def _build_module(modname):
+    """import and introspect the given module, returning its pickled tree"""
+    from astroid import builder
+    from astroid import manager
+    from astroid import modutils
+    living = modutils.load_module_from_name(modname)
+    astroid_builder = builder.AstroidBuilder(manager.AstroidManager(),
+                                             apply_transforms=False)
+    return disk_cache.dumps(astroid_builder.module_build(living, modname))
+
+
+class IntrospectionPool(object):
+    """Pool of helper processes introspecting living modules.
+
+    The processes are started on first use and reused afterwards. They
+    are stopped when one of them doesn't answer within *timeout* seconds,
+    and started again on next use.
+    """
+
+    def __init__(self, processes=1, timeout=None):
+        self.processes = processes
+        self.timeout = timeout
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes)
+        return self._pool
+
+    def apply(self, function, *args):
+        """call the given function with the given arguments in a helper
+        process and return its result
+
+        The function and the arguments must be picklable, and exceptions
+        raised by the function are raised again in this process.
+        IntrospectionTimeout is raised if the result doesn't come in time.
+        """
+        result = self._get_pool().apply_async(function, args)
+        try:
+            return result.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            self.close()
+            raise IntrospectionTimeout('%s%r timed out' % (function.__name__, args))
+
+    def build_module(self, modname):
+        """return the tree of the given module, built by a helper process,
+        or None if it couldn't be sent back
+        """
+        return disk_cache.loads(self.apply(_build_module, modname))
+
+    def build_modules(self, modnames):
+        """return a dictionary of the trees of the given modules, built in
+        parallel by the helper processes
+
+        The modules which couldn't be built are left out, as well as the
+        remaining ones once a helper process doesn't answer in time.
+        """
+        modnames = list(modnames)
+        results = [self._get_pool().apply_async(_build_module, (modname, ))
+                   for modname in modnames]
+        trees = {}
+        for modname, result in zip(modnames, results):
+            try:
+                tree = disk_cache.loads(result.get(self.timeout))
+            except multiprocessing.TimeoutError:
+                self.close()
+                break
+            except Exception: # pylint: disable=broad-except
+                continue
+            if tree is not None:
+                trees[modname] = tree
+        return trees
+
+    def close(self):
+        """stop the helper processes"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
@@ -20,6 +20,7 @@ possible by providing a class responsible to get astroid representation
 from various source and using a cache of built modules)
 """
 
+import collections
 import imp
 import os
 import sys
@@ -27,12 +28,25 @@ import zipimport
 
 import six
 
+from astroid import brain
+from astroid import disk_cache
 from astroid import exceptions
+from astroid import introspection
 from astroid import modutils
 from astroid import transforms
 from astroid import util
 
 
+# what is kept of the docstrings and of the source bytes of the modules built
+# from source: all of it, nothing once the tree is built and transformed, or
+# nothing at all
+KEEP = 'keep'
+DROP = 'drop'
+OMIT = 'omit'
+RetentionPolicy = collections.namedtuple('RetentionPolicy', 'docstrings source')
+_DEFAULT_RETENTION = RetentionPolicy(KEEP, KEEP)
+
+
 def safe_repr(obj):
     try:
         return repr(obj)
@@ -57,18 +71,39 @@ class AstroidManager(object):
             self.astroid_cache = {}
             self._mod_file_cache = {}
             self._failed_import_hooks = []
+            self._clear_cache_hooks = []
             self.always_load_extensions = False
+            self.lazy_inspection = False
             self.optimize_ast = False
             self.extension_package_whitelist = set()
+            # package prefix -> RetentionPolicy, see set_retention_policy
+            self.retention_policies = {}
+            # directories where stub files for compiled modules are looked for
+            self.stub_path = []
+            # number of helper processes introspecting the compiled modules,
+            # which are imported in this process if it's 0
+            self.introspection_processes = 0
+            # seconds after which a helper process not answering is stopped
+            # and the module it was introspecting isn't imported
+            self.introspection_timeout = 60
+            self._introspection_pool = None
             self._transform = transforms.TransformVisitor()
 
             # Export these APIs for convenience
             self.register_transform = self._transform.register_transform
             self.unregister_transform = self._transform.unregister_transform
+            self.has_transforms = self._transform.has_transforms
 
-    def visit_transforms(self, node):
-        """Visit the transforms and apply them to the given *node*."""
-        return self._transform.visit(node)
+    def visit_transforms(self, node, skip=()):
+        """Visit the transforms and apply them to the given *node*, except
+        to the subtrees of the nodes given in *skip*."""
+        brain.load_module_plugins(node)
+        return self._transform.visit(node, skip)
+
+    def visit_children_transforms(self, node):
+        """Apply the transforms to the children of the given *node*, added
+        to a tree which was already transformed."""
+        self._transform.visit_children(node)
 
     def ast_from_file(self, filepath, modname=None, fallback=True, source=False):
         """given a module name, return the astroid object"""
@@ -106,12 +141,37 @@ class AstroidManager(object):
             '.'.join(parts[:x]) in self.extension_package_whitelist
             for x in range(1, len(parts) + 1))
 
+    def set_retention_policy(self, prefix, docstrings=KEEP, source=KEEP):
+        """set what is kept of the docstrings and of the source bytes of the
+        modules named prefix or prefix followed by a dot and a name
+
+        Each of them may be KEEP, DROP or OMIT. It only applies to the
+        modules built from source afterwards.
+        """
+        for retention in (docstrings, source):
+            if retention not in (KEEP, DROP, OMIT):
+                raise ValueError('Unknown retention %r' % (retention, ))
+        self.retention_policies[prefix] = RetentionPolicy(docstrings, source)
+
+    def retention_policy(self, modname):
+        """return the retention policy of the given module, the one set for
+        its longest package prefix"""
+        if self.retention_policies:
+            parts = modname.split('.')
+            for index in range(len(parts), 0, -1):
+                policy = self.retention_policies.get('.'.join(parts[:index]))
+                if policy is not None:
+                    return policy
+        return _DEFAULT_RETENTION
+
     def ast_from_module_name(self, modname, context_file=None):
         """given a module name, return the astroid object"""
         if modname in self.astroid_cache:
             return self.astroid_cache[modname]
         if modname == '__main__':
             return self._build_stub_module(modname)
+        # the brain plugins may provide failed import hooks for this module
+        brain.load_plugins(modname)
         old_cwd = os.getcwd()
         if context_file:
             os.chdir(os.path.dirname(context_file))
@@ -122,8 +182,13 @@ class AstroidManager(object):
                 if module is not None:
                     return module
             elif mp_type in (imp.C_BUILTIN, imp.C_EXTENSION):
-                if mp_type == imp.C_EXTENSION and not self._can_load_extension(modname):
-                    return self._build_stub_module(modname)
+                module = self._ast_from_stub(modname, filepath)
+                if module is not None:
+                    return module
+                if mp_type == imp.C_EXTENSION:
+                    if not self._can_load_extension(modname):
+                        return self._build_stub_module(modname)
+                    return self._ast_from_extension(modname, filepath)
                 try:
                     module = modutils.load_module_from_name(modname)
                 except Exception as ex: # pylint: disable=broad-except
@@ -150,6 +215,75 @@ class AstroidManager(object):
         finally:
             os.chdir(old_cwd)
 
+    def _ast_from_stub(self, modname, filepath):
+        """build the astroid object of a compiled module from its stub file,
+        if it has one, instead of importing it
+        """
+        stubpath = modutils.get_stub_file(modname, filepath, self.stub_path)
+        if stubpath is None:
+            return None
+        from astroid.builder import AstroidBuilder
+        try:
+            return AstroidBuilder(self).file_build(stubpath, modname)
+        except exceptions.AstroidSyntaxError:
+            # stubs are written with the python 3 syntax
+            return None
+
+    def _ast_from_extension(self, modname, filepath):
+        """build the astroid object of a compiled extension module
+
+        The module is imported and introspected by a helper process when
+        the introspection_processes option is set, else in this process.
+        The trees built by introspection are stored in the on-disk cache,
+        before applying the transforms, so that the extension doesn't have
+        to be imported and introspected again as long as its file is the
+        same.
+        """
+        try:
+            stat = os.stat(filepath)
+        except (OSError, TypeError):
+            key = None
+        else:
+            key = (modname, os.path.abspath(filepath), stat.st_size, stat.st_mtime)
+            module = disk_cache.load('extensions', key)
+            if module is not None:
+                self.cache_module(module)
+                return self.visit_transforms(module)
+        module = None
+        try:
+            if self.introspection_processes:
+                module = self.introspection_pool().build_module(modname)
+            if module is None:
+                living = modutils.load_module_from_name(modname)
+        except Exception as ex: # pylint: disable=broad-except
+            util.reraise(exceptions.AstroidImportError(
+                'Loading {modname} failed with:\n{error}',
+                modname=modname, path=filepath, error=ex))
+        if module is not None:
+            self.cache_module(module)
+        elif key is None or disk_cache.cache_directory() is None:
+            return self.ast_from_module(living, modname)
+        else:
+            from astroid.builder import AstroidBuilder
+            builder = AstroidBuilder(self, apply_transforms=False)
+            module = builder.module_build(living, modname)
+        if key is not None:
+            disk_cache.store('extensions', key, module)
+        return self.visit_transforms(module)
+
+    def introspection_pool(self):
+        """return the pool of helper processes introspecting the compiled
+        modules, sized after the introspection_processes option
+        """
+        pool = self._introspection_pool
+        if pool is None or pool.processes != self.introspection_processes:
+            if pool is not None:
+                pool.close()
+            pool = introspection.IntrospectionPool(self.introspection_processes)
+            self._introspection_pool = pool
+        pool.timeout = self.introspection_timeout
+        return pool
+
     def zip_import_data(self, filepath):
         if zipimport is None:
             return None
@@ -264,6 +398,12 @@ class AstroidManager(object):
         """
         self._failed_import_hooks.append(hook)
 
+    def register_clear_cache_hook(self, hook):
+        """Registers a hook called without argument by clear_cache, to throw
+        away the data cached out of the manager, such as trees of modules.
+        """
+        self._clear_cache_hooks.append(hook)
+
     def cache_module(self, module):
         """Cache a module if no module with the same name is known yet."""
         self.astroid_cache.setdefault(module.name, module)
@@ -271,6 +411,8 @@ class AstroidManager(object):
     def clear_cache(self, astroid_builtin=None):
         # XXX clear transforms
         self.astroid_cache.clear()
+        for hook in self._clear_cache_hooks:
+            hook()
         # force bootstrap again, else we may ends up with cache inconsistency
         # between the manager and CONST_PROXY, making
         # unittest_lookup.LookupTC.test_builtin_lookup fail depending on the
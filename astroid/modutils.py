@@ -20,6 +20,9 @@
 :type PY_SOURCE_EXTS: tuple(str)
 :var PY_SOURCE_EXTS: list of possible python source file extension
 
+:type STUB_EXT: str
+:var STUB_EXT: extension of the stub files describing modules
+
 :type STD_LIB_DIRS: set of str
 :var STD_LIB_DIRS: directories where standard modules are located
 
@@ -49,6 +52,8 @@ else:
     PY_SOURCE_EXTS = ('py',)
     PY_COMPILED_EXTS = ('so',)
 
+STUB_EXT = 'pyi'
+
 # Notes about STD_LIB_DIRS
 # Consider arch-specific installation for STD_LIB_DIRS definition
 # :mod:`distutils.sysconfig` contains to much hardcoded values to rely on
@@ -468,6 +473,41 @@ def is_python_source(filename):
     return os.path.splitext(filename)[1][1:] in PY_SOURCE_EXTS
 
 
+def get_stub_file(modname, filename=None, stub_path=None):
+    """return the path of the stub file (.pyi) describing the given module,
+    if there is one
+
+    The stub file is first looked for next to the module's file, then in
+    the given directories, where stubs are laid out as the modules they
+    describe (i.e. `a/b.pyi` or `a/b/__init__.pyi` for module `a.b`).
+
+    :type modname: str
+    :param modname: name of the module
+
+    :type filename: str or None
+    :param filename: path of the module's file, if any
+
+    :type stub_path: list or None
+    :param stub_path: optional list of directories containing stub files
+
+    :rtype: str or None
+    :return: the absolute path of the stub file, or None
+    """
+    parts = modname.split('.')
+    candidates = []
+    if filename:
+        candidates.append(os.path.join(os.path.dirname(filename),
+                                       parts[-1] + '.' + STUB_EXT))
+    for directory in stub_path or ():
+        base = os.path.join(directory, *parts)
+        candidates.append(base + '.' + STUB_EXT)
+        candidates.append(os.path.join(base, '__init__.' + STUB_EXT))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return os.path.abspath(candidate)
+    return None
+
+
 def is_standard_module(modname, std_path=None):
     """try to guess if a module is a standard python module (by default,
     see `std_path` parameter's description)
@@ -19,6 +19,7 @@
 """
 
 import abc
+import importlib
 import pprint
 import warnings
 try:
@@ -160,6 +161,24 @@ class NodeNG(object):
         self.col_offset = col_offset
         self.parent = parent
 
+    def __getstate__(self):
+        # the node index is rebuilt on demand, and the results cached by
+        # decorators.cached and the classes synthesized by the brain plugins
+        # may hold unpicklable objects
+        state = self.__dict__.copy()
+        state.pop('_node_index', None)
+        state.pop('__cache', None)
+        state.pop('_synthesized', None)
+        return state
+
+    def __setstate__(self, state):
+        # defined so that pickle doesn't look for it through the __getattr__
+        # of the proxy nodes, which don't have their proxied object yet
+        for field in ('name', 'attrname'):
+            if field in state:
+                state[field] = util.intern_name(state[field])
+        self.__dict__.update(state)
+
     def infer(self, context=None, **kwargs):
         """main interface to the interface system, return a generator on inferred
         values.
@@ -341,27 +360,50 @@ class NodeNG(object):
         # FIXME: raise an exception if nearest is None ?
         return nearest[0]
 
-    # these are lazy because they're relatively expensive to compute for every
-    # single node, and they rarely get looked at
+    # these are read from the node index of the module, where they are
+    # computed for all the nodes at once, and else computed on demand
 
-    @decorators.cachedproperty
+    @property
     def fromlineno(self):
+        lines = self._indexed_lines()
+        if lines is None:
+            return self._compute_fromlineno()
+        return lines[0]
+
+    @property
+    def tolineno(self):
+        lines = self._indexed_lines()
+        if lines is None:
+            return self._compute_tolineno()
+        return lines[1]
+
+    def _indexed_lines(self):
+        """return the first and last line numbers of the node found in the
+        node index of its module, built again if it was thrown away, or None
+        if the node isn't part of a module"""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        if getattr(type(root), 'node_index', None) is None:
+            return None
+        return root.node_index().lines(self)
+
+    def _compute_fromlineno(self):
         if self.lineno is None:
             return self._fixed_source_line()
         else:
             return self.lineno
 
-    @decorators.cachedproperty
-    def tolineno(self):
-        if not self._astroid_fields:
-            # can't have children
-            lastchild = None
-        else:
-            lastchild = self.last_child()
-        if lastchild is None:
-            return self.fromlineno
-        else:
-            return lastchild.tolineno
+    def _compute_tolineno(self):
+        # walk down the last children instead of recursing, so that deeply
+        # nested expressions don't exhaust the stack
+        node = self
+        while node._astroid_fields:
+            lastchild = node.last_child()
+            if lastchild is None:
+                break
+            node = lastchild
+        return node.fromlineno
 
         # TODO / FIXME:
         assert self.fromlineno is not None, self
@@ -400,12 +442,20 @@ class NodeNG(object):
 
         klass may be a class object or a tuple of class objects
         """
+        node_index = getattr(self.root(), 'node_index', None)
+        if node_index is not None:
+            matching = node_index().nodes_of_class(self, klass, skip_klass)
+            if matching is not None:
+                return iter(matching)
+        return self._walk_nodes_of_class(klass, skip_klass)
+
+    def _walk_nodes_of_class(self, klass, skip_klass):
         if isinstance(self, klass):
             yield self
         for child_node in self.get_children():
             if skip_klass is not None and isinstance(child_node, skip_klass):
                 continue
-            for matching in child_node.nodes_of_class(klass, skip_klass):
+            for matching in child_node._walk_nodes_of_class(klass, skip_klass):
                 yield matching
 
     def _infer_name(self, frame, name):
@@ -603,6 +653,14 @@ class Statement(NodeNG):
 
 
 
+def _lazy_children_built(node):
+    """called once the children of a lazily built node are built"""
+    # they aren't part of the index of the nodes of the module
+    invalidate_node_index = getattr(node.root(), 'invalidate_node_index', None)
+    if invalidate_node_index is not None:
+        invalidate_node_index()
+
+
 @six.add_metaclass(abc.ABCMeta)
 class _BaseContainer(mixins.ParentAssignTypeMixin,
                      NodeNG, bases.Instance):
@@ -617,6 +675,17 @@ class _BaseContainer(mixins.ParentAssignTypeMixin,
     def postinit(self, elts):
         self.elts = elts
 
+    def __getattr__(self, name):
+        # the elements of a large literal container made of constants are
+        # only built when first needed, see rebuilder.TreeRebuilder
+        if name == 'elts' and '_constants' in self.__dict__:
+            self.elts = [Const(value, lineno, col_offset, self)
+                         for value, lineno, col_offset
+                         in self.__dict__.pop('_constants')]
+            _lazy_children_built(self)
+            return self.elts
+        return super(_BaseContainer, self).__getattr__(name)
+
     @classmethod
     def from_constants(cls, elts=None):
         # pylint: disable=abstract-class-instantiated; False positive on Pylint #627.
@@ -698,6 +767,11 @@ class LookupMixIn(object):
         if not myframe is frame or self is frame:
             return stmts
         mystmt = self.statement()
+        if offset == 0 and hasattr(self, 'name'):
+            # the scope may know exactly which definitions reach this node
+            reaching = frame._reaching_definitions(self, stmts)
+            if reaching is not None:
+                return reaching
         # line filtering if we are in the same frame
         #
         # take care node may be missing lineno information (this is the case for
@@ -862,9 +936,8 @@ class Arguments(mixins.AssignTypeMixin, NodeNG):
             return name
         return None
 
-    @decorators.cachedproperty
-    def fromlineno(self):
-        lineno = super(Arguments, self).fromlineno
+    def _compute_fromlineno(self):
+        lineno = super(Arguments, self)._compute_fromlineno()
         return max(lineno, self.parent.fromlineno or 0)
 
     def format_args(self):
@@ -1173,6 +1246,13 @@ class Comprehension(NodeNG):
         return stmts, False
 
 
+class _ConstSingleton(object):
+    """name of a builtin singleton held by a pickled Const node"""
+
+    def __init__(self, name):
+        self.name = name
+
+
 class Const(NodeNG, bases.Instance):
     """represent a constant node like num, str, bool, None, bytes"""
     _other_fields = ('value',)
@@ -1181,6 +1261,21 @@ class Const(NodeNG, bases.Instance):
         self.value = value
         super(Const, self).__init__(lineno, col_offset, parent)
 
+    def __getstate__(self):
+        state = super(Const, self).__getstate__()
+        # python 2 can't pickle these singletons, store them by name
+        if state.get('value') is NotImplemented:
+            state['value'] = _ConstSingleton('NotImplemented')
+        elif state.get('value') is Ellipsis:
+            state['value'] = _ConstSingleton('Ellipsis')
+        return state
+
+    def __setstate__(self, state):
+        value = state.get('value')
+        if isinstance(value, _ConstSingleton):
+            state['value'] = getattr(six.moves.builtins, value.name)
+        super(Const, self).__setstate__(state)
+
     def getitem(self, index, context=None):
         if isinstance(self.value, six.string_types):
             return Const(self.value[index])
@@ -1249,6 +1344,8 @@ class Delete(mixins.AssignTypeMixin, Statement):
 class Dict(NodeNG, bases.Instance):
     """class representing a Dict node"""
     _astroid_fields = ('items',)
+    # see _item_index()
+    _items_index = None
 
     def __init__(self, lineno=None, col_offset=None, parent=None):
         self.items = []
@@ -1257,6 +1354,18 @@ class Dict(NodeNG, bases.Instance):
     def postinit(self, items):
         self.items = items
 
+    def __getattr__(self, name):
+        # the items of a large literal dictionary made of constants are only
+        # built when first needed, see rebuilder.TreeRebuilder
+        if name == 'items' and '_constants' in self.__dict__:
+            self.items = [(Const(key, key_lineno, key_col_offset, self),
+                           Const(value, lineno, col_offset, self))
+                          for key, key_lineno, key_col_offset, value, lineno, col_offset
+                          in self.__dict__.pop('_constants')]
+            _lazy_children_built(self)
+            return self.items
+        return super(Dict, self).__getattr__(name)
+
     @classmethod
     def from_constants(cls, items=None):
         node = cls()
@@ -1286,8 +1395,42 @@ class Dict(NodeNG, bases.Instance):
     def itered(self):
         return self.items[::2]
 
+    def _item_index(self):
+        """return the positions of the items having a constant key, by key
+        value, and the positions of the other items
+
+        The index is built again when the items are replaced.
+        """
+        items = self.items
+        cached = self._items_index
+        if cached is not None and cached[0] is items and cached[1] == len(items):
+            return cached[2], cached[3]
+        by_key = {}
+        others = []
+        for position, (key, _) in enumerate(items):
+            if isinstance(key, Const) and key._explicit_inference is None:
+                try:
+                    # the first matching item is the one looked up
+                    by_key.setdefault(key.value, position)
+                    continue
+                except TypeError:
+                    pass
+            others.append(position)
+        self._items_index = (items, len(items), by_key, others)
+        return by_key, others
+
     def getitem(self, lookup_key, context=None):
-        for key, value in self.items:
+        by_key, others = self._item_index()
+        try:
+            found = by_key.get(lookup_key)
+        except TypeError:
+            found, others = None, range(len(self.items))
+        # only the items without a constant key preceding the one found in
+        # the index have to be inferred
+        for position in others:
+            if found is not None and position > found:
+                break
+            key, value = self.items[position]
             # TODO(cpopa): no support for overriding yet, {1:2, **{1: 3}}.
             if isinstance(key, DictUnpack):
                 try:
@@ -1300,6 +1443,8 @@ class Dict(NodeNG, bases.Instance):
                 if isinstance(inferredkey, Const) \
                         and inferredkey.value == lookup_key:
                     return value
+        if found is not None:
+            return self.items[found][1]
         # This should raise KeyError, but all call sites only catch
         # IndexError. Let's leave it like that for now.
         raise IndexError(lookup_key)
@@ -1324,9 +1469,78 @@ class Ellipsis(NodeNG): # pylint: disable=redefined-builtin
         return True
 
 
+def _is_plain_value(obj):
+    """check that the given object is made of builtin values only, pickled
+    without referencing any module"""
+    if isinstance(obj, _PLAIN_VALUE_TYPES):
+        return True
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        return all(_is_plain_value(item) for item in obj)
+    if isinstance(obj, dict):
+        return all(_is_plain_value(key) and _is_plain_value(value)
+                   for key, value in obj.items())
+    return False
+
+_PLAIN_VALUE_TYPES = ((bool, float, complex, bytes, type(None))
+                      + six.integer_types + six.string_types)
+
+
+class _ObjectReference(object):
+    """reference by name to the living object of a pickled EmptyNode"""
+
+    def __init__(self, modname, names):
+        self.modname = modname
+        self.names = names
+
+    def resolve(self):
+        obj = importlib.import_module(self.modname)
+        for name in self.names:
+            obj = getattr(obj, name)
+        return obj
+
+
 class EmptyNode(NodeNG):
     """class representing an EmptyNode node"""
 
+    def __getstate__(self):
+        state = super(EmptyNode, self).__getstate__()
+        if not self.has_underlying_object():
+            return state
+        obj = state.pop('object')
+        if _is_plain_value(obj):
+            state['object'] = obj
+        else:
+            # other living objects are looked up again by name, once needed,
+            # so that loading a tree doesn't import the modules they come
+            # from. They are forgotten if they can't be found that way.
+            reference = self._object_reference()
+            if reference is not None:
+                state['_object_reference'] = reference
+        return state
+
+    def __getattr__(self, name):
+        if name != 'object':
+            raise AttributeError(name)
+        reference = self.__dict__.pop('_object_reference', None)
+        if reference is None:
+            raise AttributeError(name)
+        try:
+            self.object = reference.resolve()
+        except Exception: # pylint: disable=broad-except
+            raise AttributeError(name)
+        return self.object
+
+    def _object_reference(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            name = getattr(node, 'name', None)
+            if not isinstance(name, six.string_types):
+                return None
+            names.insert(0, name)
+            node = node.parent
+        return _ObjectReference(node.name, names)
+
 
 class ExceptHandler(mixins.AssignTypeMixin, Statement):
     """class representing an ExceptHandler node"""
@@ -0,0 +1,349 @@
+# copyright 2003-2015 LOGILAB S.A. (Paris, FRANCE), all rights reserved.
+# contact http://www.logilab.fr/ -- mailto:contact@logilab.fr
+#
+# This file is part of astroid.
+#
+# astroid is free software: you can redistribute it and/or modify it
+# under the terms of the GNU Lesser General Public License as published by the
+# Free Software Foundation, either version 2.1 of the License, or (at your
+# option) any later version.
+#
+# astroid is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+# for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with astroid. If not, see <http://www.gnu.org/licenses/>.
+"""Index of the nodes of a tree by class and by position.
+
+Every node of the tree gets its position in a preorder walk of the tree, so
+that the nodes of a subtree are exactly the ones whose position lies between
+the position of the subtree root and the end of its span. Queries for the
+nodes of a given class under a given node are then answered by bisecting the
+sorted positions of the nodes of that class.
+
+The first and last line numbers of the nodes are computed for the whole
+tree at once, when first needed, and kept in arrays by position. Sorted by
+their start, they answer position queries by bisection too.
+"""
+
+import array
+import bisect
+
+import six
+
+# stands for an unknown line number in the arrays of line numbers
+_NO_LINENO = -1
+
+
+def _is_class_spec(klass):
+    """check that the given object is a class or a flat tuple of classes"""
+    if isinstance(klass, type):
+        return True
+    return (isinstance(klass, tuple)
+            and all(isinstance(item, type) for item in klass))
+
+
+def _matches_const(klass):
+    """check whether the given class spec matches the Const nodes, which
+    are the only children of the lazy containers not built yet"""
+    from astroid import node_classes
+    if isinstance(klass, type):
+        klass = (klass, )
+    return any(issubclass(node_classes.Const, item) for item in klass)
+
+
+class NodeIndex(object):
+    """Index of the nodes of a tree, by class and by position in the tree.
+
+    The index is a snapshot: it must be thrown away when the tree is
+    modified.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # nodes in preorder and, for each of them, the position following
+        # the last node of its subtree and the position of its parent
+        self.nodes = nodes = []
+        self.ends = ends = []
+        self.parents = parents = []
+        # node -> position
+        self.positions = positions = {}
+        # node class -> tuple of the nodes of exactly this class, in preorder
+        self.by_class = {}
+        self._starts = {}
+        self._matching = {}
+        # positions of the nodes whose children aren't built yet
+        self._lazy = []
+        # first and last line numbers of the nodes, see _lines()
+        self._fromlinenos = None
+        self._tolinenos = None
+        self._computing_lines = False
+        # starts of the nodes and of the statements in order, see
+        # _sorted_node_starts() and _sorted_statement_starts()
+        self._node_starts = None
+        self._statement_starts = None
+
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            position = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            positions[node] = position
+            self._starts.setdefault(node.__class__, []).append(position)
+            if '_constants' in node.__dict__:
+                # the elements of a large literal container aren't built
+                # until they are needed, see rebuilder.TreeRebuilder
+                self._lazy.append(position)
+                continue
+            children = list(node.get_children())
+            for child in reversed(children):
+                stack.append((child, position))
+        ends.extend(range(1, len(nodes) + 1))
+        for position in range(len(nodes) - 1, 0, -1):
+            parent = parents[position]
+            if ends[position] > ends[parent]:
+                ends[parent] = ends[position]
+        for cls, starts in self._starts.items():
+            self.by_class[cls] = tuple(nodes[start] for start in starts)
+
+    def span(self, node):
+        """return the (start, end) positions of the subtree of the given
+        node, or None if the node isn't part of the index
+        """
+        position = self.positions.get(node)
+        if position is None:
+            return None
+        return position, self.ends[position]
+
+    def lines(self, node):
+        """return the first and the last line numbers of the given node, as
+        its fromlineno and tolineno attributes, or None if the node isn't part
+        of the index or if they are being computed
+        """
+        position = self.positions.get(node)
+        if position is None or self._computing_lines:
+            return None
+        fromlinenos, tolinenos = self._lines()
+        fromlineno, tolineno = fromlinenos[position], tolinenos[position]
+        return (None if fromlineno == _NO_LINENO else fromlineno,
+                None if tolineno == _NO_LINENO else tolineno)
+
+    def _lines(self):
+        """return the arrays of the first and of the last line numbers of
+        the nodes, by position, building them if needed"""
+        if self._fromlinenos is None:
+            # the nodes computing their own line numbers get them from the
+            # other nodes, which compute them too meanwhile
+            self._computing_lines = True
+            try:
+                fromlinenos = self._build_fromlinenos()
+                self._tolinenos = self._build_tolinenos(fromlinenos)
+                self._fromlinenos = fromlinenos
+            finally:
+                self._computing_lines = False
+        return self._fromlinenos, self._tolinenos
+
+    def _build_fromlinenos(self):
+        from astroid import node_classes
+        generic = six.get_unbound_function(node_classes.NodeNG._compute_fromlineno)
+        nodes, ends, parents = self.nodes, self.ends, self.parents
+        count = len(nodes)
+        linenos = [node.lineno for node in nodes]
+        # as NodeNG._fixed_source_line, a node without line number takes the
+        # one of its first children, or else the one of its parents
+        descendants = [None] * count
+        for position in range(count - 1, -1, -1):
+            lineno = linenos[position]
+            if lineno is None and ends[position] > position + 1:
+                lineno = descendants[position + 1]
+            descendants[position] = lineno
+        ancestors = [None] * count
+        for position in range(1, count):
+            parent = parents[position]
+            lineno = linenos[parent]
+            ancestors[position] = ancestors[parent] if lineno is None else lineno
+        fromlinenos = array.array('i', [_NO_LINENO]) * count
+        for position, node in enumerate(nodes):
+            compute = six.get_unbound_function(type(node)._compute_fromlineno)
+            if compute is not generic:
+                lineno = node._compute_fromlineno()
+            else:
+                lineno = descendants[position]
+                if lineno is None:
+                    lineno = ancestors[position]
+            if lineno is not None:
+                fromlinenos[position] = lineno
+        return fromlinenos
+
+    def _build_tolinenos(self, fromlinenos):
+        nodes, positions = self.nodes, self.positions
+        lazy = set(self._lazy)
+        tolinenos = array.array('i', fromlinenos)
+        # the last child of a node comes after it, children first
+        for position in range(len(nodes) - 1, -1, -1):
+            node = nodes[position]
+            if position in lazy:
+                # the line number of the last element is the second to last
+                # item of the constants of the container
+                tolinenos[position] = node._constants[-1][-2]
+                continue
+            if not node._astroid_fields or '_build_members' in node.__dict__:
+                continue
+            last = node.last_child()
+            if last is None:
+                continue
+            child = positions.get(last)
+            if child is not None:
+                tolinenos[position] = tolinenos[child]
+            elif last.tolineno is not None:
+                tolinenos[position] = last.tolineno
+        return tolinenos
+
+    def _sorted_node_starts(self):
+        """return the sorted (line, column) starts of the nodes and the
+        positions of the nodes in the same order, building them if needed
+
+        The nodes starting at the same place are sorted by position, so that
+        the innermost one comes last. The nodes without a column, such as the
+        arguments of a function, are left out.
+        """
+        if self._node_starts is None:
+            fromlinenos, _ = self._lines()
+            starts = sorted((fromlinenos[position], node.col_offset, position)
+                            for position, node in enumerate(self.nodes)
+                            if node.col_offset is not None)
+            self._node_starts = ([(lineno, col_offset)
+                                  for lineno, col_offset, _ in starts],
+                                 array.array('i', [start[2] for start in starts]))
+        return self._node_starts
+
+    def _sorted_statement_starts(self):
+        """return the sorted first line numbers of the statements and the
+        positions of the statements in the same order, building them if
+        needed
+        """
+        if self._statement_starts is None:
+            fromlinenos, _ = self._lines()
+            starts = sorted((fromlinenos[position], position)
+                            for position, node in enumerate(self.nodes)
+                            if node.is_statement)
+            self._statement_starts = (
+                array.array('i', [lineno for lineno, _ in starts]),
+                array.array('i', [position for _, position in starts]))
+        return self._statement_starts
+
+    def node_at(self, lineno, col_offset):
+        """return the innermost node at the given line and column, or None
+
+        As the end column of the nodes isn't known, a node is considered to
+        go on up to the end of its last line. The elements of the large
+        literal containers which aren't built yet are left out.
+        """
+        starts, positions = self._sorted_node_starts()
+        index = bisect.bisect_right(starts, (lineno, col_offset))
+        if not index:
+            return None
+        _, tolinenos = self._lines()
+        # the innermost node containing the position is the last one
+        # starting before it or one of its parents
+        position = positions[index - 1]
+        while position >= 0:
+            if tolinenos[position] >= lineno:
+                return self.nodes[position]
+            position = self.parents[position]
+        return None
+
+    def statements_in_range(self, fromlineno, tolineno):
+        """return the statements having lines between the given line
+        numbers (included), in preorder"""
+        starts, positions = self._sorted_statement_starts()
+        _, tolinenos = self._lines()
+        low = bisect.bisect_left(starts, fromlineno)
+        high = bisect.bisect_right(starts, tolineno, low)
+        found = set(positions[low:high])
+        # the statements starting before the range and going on in it
+        # contain the last statement starting before the range
+        if low:
+            position = positions[low - 1]
+            while position >= 0:
+                if self.nodes[position].is_statement and tolinenos[position] >= fromlineno:
+                    found.add(position)
+                position = self.parents[position]
+        nodes = self.nodes
+        return [nodes[position] for position in sorted(found)]
+
+    def parent(self, node):
+        """return the parent of the given node in the indexed tree"""
+        position = self.parents[self.positions[node]]
+        if position < 0:
+            return None
+        return self.nodes[position]
+
+    def postorder(self, classes):
+        """return the nodes of exactly the given classes, children first"""
+        positions = []
+        for cls in classes:
+            positions.extend(self._starts.get(cls, ()))
+        ends = self.ends
+        positions.sort(key=lambda position: (ends[position], -position))
+        nodes = self.nodes
+        return [nodes[position] for position in positions]
+
+    def _matching_classes(self, klass):
+        try:
+            return self._matching[klass]
+        except KeyError:
+            matching = [cls for cls in self._starts if issubclass(cls, klass)]
+            self._matching[klass] = matching
+            return matching
+
+    def _positions_of_class(self, klass, start, end):
+        positions = []
+        classes = self._matching_classes(klass)
+        for cls in classes:
+            starts = self._starts[cls]
+            low = bisect.bisect_left(starts, start)
+            high = bisect.bisect_left(starts, end, low)
+            positions.extend(starts[low:high])
+        if len(classes) > 1:
+            positions.sort()
+        return positions
+
+    def nodes_of_class(self, node, klass, skip_klass=None):
+        """return the list of nodes under the given one (included) which are
+        instances of klass, in preorder
+
+        Subtrees rooted at an instance of skip_klass, apart from the given
+        node itself, are left out. None is returned if the index can't
+        answer the query.
+        """
+        span = self.span(node)
+        if span is None or not _is_class_spec(klass):
+            return None
+        if skip_klass is not None and not _is_class_spec(skip_klass):
+            return None
+        start, end = span
+        lazy = bisect.bisect_left(self._lazy, start)
+        if (lazy < len(self._lazy) and self._lazy[lazy] < end
+                and _matches_const(klass)):
+            return None
+        positions = self._positions_of_class(klass, start, end)
+        if skip_klass is not None and positions:
+            skipped = self._positions_of_class(skip_klass, start + 1, end)
+            if skipped:
+                kept = []
+                ends = self.ends
+                index = 0
+                skip_end = -1
+                for position in positions:
+                    while index < len(skipped) and skipped[index] <= position:
+                        skip_end = max(skip_end, ends[skipped[index]])
+                        index += 1
+                    if position >= skip_end:
+                        kept.append(position)
+                positions = kept
+        nodes = self.nodes
+        return [nodes[position] for position in positions]
@@ -28,9 +28,11 @@ import types
 import six
 
 from astroid import bases
+from astroid import disk_cache
 from astroid import manager
 from astroid import node_classes
 from astroid import nodes
+from astroid import util
 
 
 MANAGER = manager.AstroidManager()
@@ -50,7 +52,7 @@ def _io_discrepancy(member):
             member.__module__ == 'io')
 
 def _attach_local_node(parent, node, name):
-    node.name = name # needed by add_local_node
+    node.name = util.intern_name(name) # needed by add_local_node
     parent.add_local_node(node)
 
 
@@ -61,11 +63,23 @@ def _add_dunder_class(func, member):
     if not cls_name:
         return
     bases = [ancestor.__name__ for ancestor in python_cls.__bases__]
-    ast_klass = build_class(cls_name, bases, python_cls.__doc__)
+    doc = python_cls.__doc__
+    if not isinstance(doc, six.string_types):
+        # the __doc__ of some builtin types is a descriptor for the __doc__
+        # of their instances
+        doc = None
+    ast_klass = build_class(cls_name, bases, doc)
     func.instance_attrs['__class__'] = [ast_klass]
 
 
-_marker = object()
+class _Marker(object):
+    """marker for the dummy nodes without an underlying object, pickled by
+    reference to keep its identity"""
+
+    def __reduce__(self):
+        return '_marker'
+
+_marker = _Marker()
 
 
 def attach_dummy_node(node, name, object=_marker):
@@ -106,10 +120,10 @@ def build_module(name, doc=None):
 
 def build_class(name, basenames=(), doc=None):
     """create and initialize a astroid ClassDef node"""
-    node = nodes.ClassDef(name, doc)
+    node = nodes.ClassDef(util.intern_name(name), doc)
     for base in basenames:
         basenode = nodes.Name()
-        basenode.name = base
+        basenode.name = util.intern_name(base)
         node.bases.append(basenode)
         basenode.parent = node
     return node
@@ -119,12 +133,12 @@ def build_function(name, args=None, defaults=None, flag=0, doc=None):
     """create and initialize a astroid FunctionDef node"""
     args, defaults = args or [], defaults or []
     # first argument is now a list of decorators
-    func = nodes.FunctionDef(name, doc)
+    func = nodes.FunctionDef(util.intern_name(name), doc)
     func.args = argsnode = nodes.Arguments()
     argsnode.args = []
     for arg in args:
         argsnode.args.append(nodes.Name())
-        argsnode.args[-1].name = arg
+        argsnode.args[-1].name = util.intern_name(arg)
         argsnode.args[-1].parent = argsnode
     argsnode.defaults = []
     for default in defaults:
@@ -257,6 +271,7 @@ class InspectBuilder(object):
     def __init__(self):
         self._done = {}
         self._module = None
+        self._lazy = False
 
     def inspect_build(self, module, modname=None, path=None):
         """build astroid from a living module (i.e. using inspect)
@@ -276,6 +291,7 @@ class InspectBuilder(object):
         MANAGER.cache_module(node)
         node.package = hasattr(module, '__path__')
         self._done = {}
+        self._lazy = MANAGER.lazy_inspection
         self.object_build(node, module)
         return node
 
@@ -286,6 +302,30 @@ class InspectBuilder(object):
         if obj in self._done:
             return self._done[obj]
         self._done[obj] = node
+        self._build_members(node, obj)
+
+    def _build_lazily(self, node, obj):
+        """register the given class node to get its members built from the
+        given living class when they are first needed"""
+        self._done[obj] = node
+        state = self._module, self._done, self._lazy
+
+        def build_members(node):
+            saved = self._module, self._done, self._lazy
+            self._module, self._done, self._lazy = state
+            try:
+                self._build_members(node, obj)
+            finally:
+                self._module, self._done, self._lazy = saved
+            self._members_built(node)
+
+        del node.locals, node.body
+        node._build_members = build_members
+
+    def _members_built(self, node):
+        """called once the members of a lazily built class are built"""
+
+    def _build_members(self, node, obj):
         for name in dir(obj):
             try:
                 member = getattr(obj, name)
@@ -307,12 +347,22 @@ class InspectBuilder(object):
                     continue
                 if member in self._done:
                     class_node = self._done[member]
-                    if class_node not in node.locals.get(name, ()):
+                    if class_node in node.locals.get(name, ()):
+                        pass
+                    elif self._lazy and class_node.parent is not None:
+                        # the members of lazily built classes are built
+                        # after the module's ones, don't take the classes
+                        # they refer to away from their module
+                        node.set_local(name, class_node)
+                    else:
                         node.add_local_node(class_node, name)
                 else:
                     class_node = object_build_class(node, member, name)
-                    # recursion
-                    self.object_build(class_node, member)
+                    if self._lazy:
+                        self._build_lazily(class_node, member)
+                    else:
+                        # recursion
+                        self.object_build(class_node, member)
                 if name == '__class__' and class_node.parent is None:
                     class_node.parent = self._done[self._module]
             elif inspect.ismethoddescriptor(member):
@@ -375,13 +425,50 @@ class InspectBuilder(object):
 Astroid_BUILDER = InspectBuilder()
 
 _CONST_PROXY = {}
+def _build_builtins():
+    """build the trees of the builtins module and of the generator type by
+    introspection"""
+    astroid_builtin = Astroid_BUILDER.inspect_build(six.moves.builtins)
+    generator_type = nodes.ClassDef(types.GeneratorType.__name__,
+                                    types.GeneratorType.__doc__)
+    generator_type.parent = astroid_builtin
+    Astroid_BUILDER.object_build(generator_type, types.GeneratorType)
+    return astroid_builtin, generator_type
+
+
+# pickled trees of the builtins module and of the generator type, taken
+# before any plugin modifies them, to bootstrap again quickly
+_BUILTINS_SNAPSHOT = None
+
+
+def _load_builtins():
+    """return the trees of the builtins module and of the generator type,
+    from a snapshot when there is one
+    """
+    global _BUILTINS_SNAPSHOT # pylint: disable=global-statement
+    # the snapshot is only good for the same set of builtins
+    key = sorted(vars(six.moves.builtins))
+    if _BUILTINS_SNAPSHOT is None:
+        _BUILTINS_SNAPSHOT = disk_cache.read('builtins', key)
+    if _BUILTINS_SNAPSHOT is not None:
+        trees = disk_cache.loads(_BUILTINS_SNAPSHOT)
+        if trees is not None:
+            MANAGER.cache_module(trees[0])
+            return trees
+    trees = _build_builtins()
+    if disk_cache.cache_directory() is not None:
+        _BUILTINS_SNAPSHOT = disk_cache.dumps(trees)
+        disk_cache.write('builtins', key, _BUILTINS_SNAPSHOT)
+    return trees
+
+
 def _astroid_bootstrapping(astroid_builtin=None):
     """astroid boot strapping the builtins module"""
     # this boot strapping is necessary since we need the Const nodes to
     # inspect_build builtins, and then we can proxy Const
-    if astroid_builtin is None:
-        from six.moves import builtins
-        astroid_builtin = Astroid_BUILDER.inspect_build(builtins)
+    built = astroid_builtin is None
+    if built:
+        astroid_builtin, bases.Generator._proxied = _load_builtins()
 
     for cls, node_cls in node_classes.CONST_CLS.items():
         if cls is type(None):
@@ -396,6 +483,9 @@ def _astroid_bootstrapping(astroid_builtin=None):
             node_cls._proxied = proxy
         else:
             _CONST_PROXY[cls] = proxy
+    if built:
+        # let the brain plugins extend the new tree
+        MANAGER.visit_transforms(astroid_builtin)
 
 _astroid_bootstrapping()
 
@@ -405,8 +495,3 @@ _astroid_bootstrapping()
 def _set_proxied(const):
     return _CONST_PROXY[const.value.__class__]
 nodes.Const._proxied = property(_set_proxied)
-
-_GeneratorType = nodes.ClassDef(types.GeneratorType.__name__, types.GeneratorType.__doc__)
-_GeneratorType.parent = MANAGER.astroid_cache[six.moves.builtins.__name__]
-bases.Generator._proxied = _GeneratorType
-Astroid_BUILDER.object_build(bases.Generator._proxied, types.GeneratorType)
@@ -20,11 +20,14 @@ order to get a single Astroid representation
 """
 
 import _ast
+import inspect
 import sys
 
 import astroid
 from astroid import astpeephole
+from astroid import manager as managermod
 from astroid import nodes
+from astroid import util
 
 
 
@@ -85,6 +88,15 @@ CONTEXTS = {_ast.Load: astroid.Load,
             _ast.Del: astroid.Del,
             _ast.Param: astroid.Store}
 
+# literal containers with at least this number of elements, all of them
+# constants, keep the values of their elements until their nodes are needed
+LAZY_CONTAINER_SIZE = 1000
+_CONSTANT_FIELDS = {_ast.Num: 'n', _ast.Str: 's'}
+if PY3:
+    _CONSTANT_FIELDS[_ast.Bytes] = 's'
+if PY34:
+    _CONSTANT_FIELDS[_ast.NameConstant] = 'value'
+
 
 def _get_doc(node):
     try:
@@ -113,6 +125,31 @@ def _get_context(node):
     return CONTEXTS.get(type(node.ctx), astroid.Load)
 
 
+def _literal_constants(nodes_):
+    """return the (value, lineno, col_offset) tuples of the given _ast nodes
+    if they are all literal constants, None otherwise
+    """
+    constants = []
+    for node in nodes_:
+        field = _CONSTANT_FIELDS.get(node.__class__)
+        if field is not None:
+            value = getattr(node, field)
+        elif (node.__class__ is _ast.Name and node.id in CONST_NAME_TRANSFORMS
+              and isinstance(node.ctx, _ast.Load)):
+            value = CONST_NAME_TRANSFORMS[node.id]
+        else:
+            return None
+        constants.append((value, node.lineno, node.col_offset))
+    return constants
+
+
+def _build_lazily(node, field, constants):
+    """keep the given constants in the given container node, whose children
+    are only built from them when the given field is first needed"""
+    delattr(node, field)
+    node._constants = constants
+
+
 class TreeRebuilder(object):
     """Rebuilds the _ast tree to become an Astroid tree"""
 
@@ -123,26 +160,106 @@ class TreeRebuilder(object):
         self._delayed_assattr = []
         self._visit_meths = {}
         self._peepholer = astpeephole.ASTPeepholeOptimizer()
+        self._omit_docstrings = False
 
-    def visit_module(self, node, modname, modpath, package):
-        """visit a Module node by returning a fresh instance of it"""
+    def _get_doc(self, node):
         node, doc = _get_doc(node)
+        if self._omit_docstrings:
+            doc = None
+        return node, doc
+
+    def _lazy_constants(self, nodes_):
+        """return the constants of the elements of a large literal container
+        which can be built lazily, None otherwise"""
+        if len(nodes_) < LAZY_CONTAINER_SIZE:
+            return None
+        # the transforms of the constants wouldn't be applied to the elements
+        # built afterwards
+        if self._manager.has_transforms(nodes.Const):
+            return None
+        return _literal_constants(nodes_)
+
+    def visit_module(self, node, modname, modpath, package, reused=None):
+        """visit a Module node by returning a fresh instance of it
+
+        *reused* maps the top-level statements of the _ast tree which don't
+        need to be rebuilt to the nodes of a previous tree to use instead.
+        """
+        policy = self._manager.retention_policy(modname)
+        self._omit_docstrings = policy.docstrings == managermod.OMIT
+        node, doc = self._get_doc(node)
         newnode = nodes.Module(name=modname, doc=doc, file=modpath, path=modpath,
                                package=package, parent=None)
-        newnode.postinit([self.visit(child, newnode) for child in node.body])
+        reused = reused or {}
+        newnode.postinit([self._reuse(reused[child], newnode) if child in reused
+                          else self.visit(child, newnode)
+                          for child in node.body])
+        newnode.node_index()
         return newnode
 
-    def visit(self, node, parent):
-        cls = node.__class__
-        if cls in self._visit_meths:
-            visit_method = self._visit_meths[cls]
-        else:
+    def _reuse(self, node, parent):
+        """move the given definition of a previous tree to the new parent
+        instead of rebuilding it"""
+        node.parent = parent
+        self._save_assignment(node)
+        return node
+
+    def _visit_method(self, cls):
+        """return the visit method of the given _ast class, and whether it
+        is a generator"""
+        try:
+            return self._visit_meths[cls]
+        except KeyError:
             cls_name = cls.__name__
             visit_name = 'visit_' + REDIRECT.get(cls_name, cls_name).lower()
             visit_method = getattr(self, visit_name)
-            self._visit_meths[cls] = visit_method
+            self._visit_meths[cls] = (visit_method,
+                                      inspect.isgeneratorfunction(visit_method))
+            return self._visit_meths[cls]
+
+    def visit(self, node, parent):
+        visit_method, generator = self._visit_method(node.__class__)
+        if generator:
+            return self._rebuild(visit_method(node, parent))
         return visit_method(node, parent)
 
+    def _rebuild(self, generator):
+        """Rebuild the node of the given visit generator without recursion
+
+        The visit methods of the expressions, which may be nested very
+        deeply, are generators: they yield a (node, parent) tuple for each
+        child to visit, get the rebuilt child back, and finally yield the
+        node they rebuilt. Their generators are run here with an explicit
+        stack, along with the ones of the children.
+        """
+        stack = [generator]
+        value = None
+        while True:
+            request = stack[-1].send(value)
+            if request.__class__ is not tuple:
+                # this is the rebuilt node
+                stack.pop()
+                if not stack:
+                    return request
+                value = request
+                continue
+            child, parent = request
+            visit_method, generator = self._visit_method(child.__class__)
+            value = visit_method(child, parent)
+            if generator:
+                stack.append(value)
+                value = None
+
+    def _fold(self, fold, newnode):
+        """return the constant folding the given node with the given method
+        of the peephole optimizer, when the AST is optimized and the node can
+        be folded, else the node itself"""
+        if self._manager.optimize_ast:
+            folded = fold(newnode)
+            if folded is not None:
+                return folded
+        return newnode
+
     def _save_assignment(self, node, name=None):
         """save assignement situation since node.parent is not available yet"""
         if self._global_names and node.name in self._global_names[-1]:
@@ -261,21 +378,25 @@ class TreeRebuilder(object):
             # ("a" + "b" + # one thousand more + "c")
             newnode = self._peepholer.optimize_binop(node, parent)
             if newnode:
-                return newnode
+                yield newnode
+                return
 
         newnode = nodes.BinOp(_BIN_OP_CLASSES[type(node.op)],
                               node.lineno, node.col_offset, parent)
-        newnode.postinit(self.visit(node.left, newnode),
-                         self.visit(node.right, newnode))
-        return newnode
+        left = yield node.left, newnode
+        right = yield node.right, newnode
+        newnode.postinit(left, right)
+        yield self._fold(self._peepholer.fold_binop, newnode)
 
     def visit_boolop(self, node, parent):
         """visit a BoolOp node by returning a fresh instance of it"""
         newnode = nodes.BoolOp(_BOOL_OP_CLASSES[type(node.op)],
                                node.lineno, node.col_offset, parent)
-        newnode.postinit([self.visit(child, newnode)
-                          for child in node.values])
-        return newnode
+        values = []
+        for child in node.values:
+            values.append((yield child, newnode))
+        newnode.postinit(values)
+        yield self._fold(self._peepholer.fold_boolop, newnode)
 
     def visit_break(self, node, parent):
         """visit a Break node by returning a fresh instance of it"""
@@ -288,12 +409,14 @@ class TreeRebuilder(object):
         newnode = nodes.Call(node.lineno, node.col_offset, parent)
         starargs = _visit_or_none(node, 'starargs', self, newnode)
         kwargs = _visit_or_none(node, 'kwargs', self, newnode)
-        args = [self.visit(child, newnode)
-                for child in node.args]
+        args = []
+        for child in node.args:
+            args.append((yield child, newnode))
 
         if node.keywords:
-            keywords = [self.visit(child, newnode)
-                        for child in node.keywords]
+            keywords = []
+            for child in node.keywords:
+                keywords.append((yield child, newnode))
         else:
             keywords = None
         if starargs:
@@ -312,13 +435,13 @@ class TreeRebuilder(object):
             else:
                 keywords = [new_kwargs]
 
-        newnode.postinit(self.visit(node.func, newnode),
-                         args, keywords)
-        return newnode
+        func = yield node.func, newnode
+        newnode.postinit(func, args, keywords)
+        yield newnode
 
     def visit_classdef(self, node, parent, newstyle=None):
         """visit a ClassDef node to become astroid"""
-        node, doc = _get_doc(node)
+        node, doc = self._get_doc(node)
         newnode = nodes.ClassDef(node.name, doc, node.lineno,
                                  node.col_offset, parent)
         metaclass = None
@@ -352,11 +475,12 @@ class TreeRebuilder(object):
     def visit_compare(self, node, parent):
         """visit a Compare node by returning a fresh instance of it"""
         newnode = nodes.Compare(node.lineno, node.col_offset, parent)
-        newnode.postinit(self.visit(node.left, newnode),
-                         [(_CMP_OP_CLASSES[op.__class__],
-                           self.visit(expr, newnode))
-                          for (op, expr) in zip(node.ops, node.comparators)])
-        return newnode
+        left = yield node.left, newnode
+        ops = []
+        for op, expr in zip(node.ops, node.comparators):
+            ops.append((_CMP_OP_CLASSES[op.__class__], (yield expr, newnode)))
+        newnode.postinit(left, ops)
+        yield self._fold(self._peepholer.fold_compare, newnode)
 
     def visit_comprehension(self, node, parent):
         """visit a Comprehension node by returning a fresh instance of it"""
@@ -383,24 +507,29 @@ class TreeRebuilder(object):
                           for child in node.targets])
         return newnode
 
-    def _visit_dict_items(self, node, parent, newnode):
+    def visit_dict(self, node, parent):
+        """visit a Dict node by returning a fresh instance of it"""
+        newnode = nodes.Dict(node.lineno, node.col_offset, parent)
+        keys = self._lazy_constants(node.keys)
+        values = keys and _literal_constants(node.values)
+        if values:
+            _build_lazily(newnode, 'items', [key + value for key, value
+                                             in zip(keys, values)])
+            yield newnode
+            return
+        items = []
         for key, value in zip(node.keys, node.values):
-            rebuilt_value = self.visit(value, newnode)
+            rebuilt_value = yield value, newnode
             if not key:
                 # Python 3.5 and extended unpacking
                 rebuilt_key = nodes.DictUnpack(rebuilt_value.lineno,
                                                rebuilt_value.col_offset,
                                                parent)
             else:
-                rebuilt_key = self.visit(key, newnode)
-            yield rebuilt_key, rebuilt_value
-
-    def visit_dict(self, node, parent):
-        """visit a Dict node by returning a fresh instance of it"""
-        newnode = nodes.Dict(node.lineno, node.col_offset, parent)
-        items = list(self._visit_dict_items(node, parent, newnode))
+                rebuilt_key = yield key, newnode
+            items.append((rebuilt_key, rebuilt_value))
         newnode.postinit(items)
-        return newnode
+        yield newnode
 
     def visit_dictcomp(self, node, parent):
         """visit a DictComp node by returning a fresh instance of it"""
@@ -481,7 +610,7 @@ class TreeRebuilder(object):
     def _visit_functiondef(self, cls, node, parent):
         """visit an FunctionDef node to become astroid"""
         self._global_names.append({})
-        node, doc = _get_doc(node)
+        node, doc = self._get_doc(node)
         newnode = cls(node.name, doc, node.lineno,
                       node.col_offset, parent)
         if node.decorator_list:
@@ -525,8 +654,9 @@ class TreeRebuilder(object):
         else:
             newnode = nodes.Attribute(node.attr, node.lineno, node.col_offset,
                                       parent)
-        newnode.postinit(self.visit(node.value, newnode))
-        return newnode
+        value = yield node.value, newnode
+        newnode.postinit(value)
+        yield newnode
 
     def visit_global(self, node, parent):
         """visit a Global node to become astroid"""
@@ -550,10 +680,11 @@ class TreeRebuilder(object):
     def visit_ifexp(self, node, parent):
         """visit a IfExp node by returning a fresh instance of it"""
         newnode = nodes.IfExp(node.lineno, node.col_offset, parent)
-        newnode.postinit(self.visit(node.test, newnode),
-                         self.visit(node.body, newnode),
-                         self.visit(node.orelse, newnode))
-        return newnode
+        test = yield node.test, newnode
+        body = yield node.body, newnode
+        orelse = yield node.orelse, newnode
+        newnode.postinit(test, body, orelse)
+        yield newnode
 
     def visit_import(self, node, parent):
         """visit a Import node by returning a fresh instance of it"""
@@ -563,20 +694,22 @@ class TreeRebuilder(object):
         # save import names in parent's locals:
         for (name, asname) in newnode.names:
             name = asname or name
-            parent.set_local(name.split('.')[0], newnode)
+            parent.set_local(util.intern_name(name.split('.')[0]), newnode)
         return newnode
 
     def visit_index(self, node, parent):
         """visit a Index node by returning a fresh instance of it"""
         newnode = nodes.Index(parent=parent)
-        newnode.postinit(self.visit(node.value, newnode))
-        return newnode
+        value = yield node.value, newnode
+        newnode.postinit(value)
+        yield newnode
 
     def visit_keyword(self, node, parent):
         """visit a Keyword node by returning a fresh instance of it"""
         newnode = nodes.Keyword(node.arg, parent=parent)
-        newnode.postinit(self.visit(node.value, newnode))
-        return newnode
+        value = yield node.value, newnode
+        newnode.postinit(value)
+        yield newnode
 
     def visit_lambda(self, node, parent):
         """visit a Lambda node by returning a fresh instance of it"""
@@ -592,9 +725,16 @@ class TreeRebuilder(object):
                              lineno=node.lineno,
                              col_offset=node.col_offset,
                              parent=parent)
-        newnode.postinit([self.visit(child, newnode)
-                          for child in node.elts])
-        return newnode
+        constants = self._lazy_constants(node.elts)
+        if constants is not None:
+            _build_lazily(newnode, 'elts', constants)
+            yield newnode
+            return
+        elts = []
+        for child in node.elts:
+            elts.append((yield child, newnode))
+        newnode.postinit(elts)
+        yield newnode
 
     def visit_listcomp(self, node, parent):
         """visit a ListComp node by returning a fresh instance of it"""
@@ -668,9 +808,16 @@ class TreeRebuilder(object):
     def visit_set(self, node, parent):
         """visit a Set node by returning a fresh instance of it"""
         newnode = nodes.Set(node.lineno, node.col_offset, parent)
-        newnode.postinit([self.visit(child, newnode)
-                          for child in node.elts])
-        return newnode
+        constants = self._lazy_constants(node.elts)
+        if constants is not None:
+            _build_lazily(newnode, 'elts', constants)
+            yield newnode
+            return
+        elts = []
+        for child in node.elts:
+            elts.append((yield child, newnode))
+        newnode.postinit(elts)
+        yield newnode
 
     def visit_setcomp(self, node, parent):
         """visit a SetComp node by returning a fresh instance of it"""
@@ -695,9 +842,10 @@ class TreeRebuilder(object):
                                   lineno=node.lineno,
                                   col_offset=node.col_offset,
                                   parent=parent)
-        newnode.postinit(self.visit(node.value, newnode),
-                         self.visit(node.slice, newnode))
-        return newnode
+        value = yield node.value, newnode
+        slice_node = yield node.slice, newnode
+        newnode.postinit(value, slice_node)
+        yield newnode
 
     def visit_tryexcept(self, node, parent):
         """visit a TryExcept node by returning a fresh instance of it"""
@@ -726,16 +874,24 @@ class TreeRebuilder(object):
                               lineno=node.lineno,
                               col_offset=node.col_offset,
                               parent=parent)
-        newnode.postinit([self.visit(child, newnode)
-                          for child in node.elts])
-        return newnode
+        constants = self._lazy_constants(node.elts)
+        if constants is not None:
+            _build_lazily(newnode, 'elts', constants)
+            yield newnode
+            return
+        elts = []
+        for child in node.elts:
+            elts.append((yield child, newnode))
+        newnode.postinit(elts)
+        yield newnode
 
     def visit_unaryop(self, node, parent):
         """visit a UnaryOp node by returning a fresh instance of it"""
         newnode = nodes.UnaryOp(_UNARY_OP_CLASSES[node.op.__class__],
                                 node.lineno, node.col_offset, parent)
-        newnode.postinit(self.visit(node.operand, newnode))
-        return newnode
+        operand = yield node.operand, newnode
+        newnode.postinit(operand)
+        yield self._fold(self._peepholer.fold_unaryop, newnode)
 
     def visit_while(self, node, parent):
         """visit a While node by returning a fresh instance of it"""
@@ -813,8 +969,9 @@ class TreeRebuilder3(TreeRebuilder):
         newnode = nodes.Starred(ctx=context, lineno=node.lineno,
                                 col_offset=node.col_offset,
                                 parent=parent)
-        newnode.postinit(self.visit(node.value, newnode))
-        return newnode
+        value = yield node.value, newnode
+        newnode.postinit(value)
+        yield newnode
 
     def visit_try(self, node, parent):
         # python 3.3 introduce a new Try node replacing
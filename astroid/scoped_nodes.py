@@ -31,9 +31,11 @@ import six
 from astroid import bases
 from astroid import context as contextmod
 from astroid import exceptions
+from astroid import flow
 from astroid import manager
 from astroid import mixins
 from astroid import node_classes
+from astroid import node_index as node_index_mod
 from astroid import decorators as decorators_mod
 from astroid import util
 
@@ -138,6 +140,17 @@ class LocalsDictNodeNG(node_classes.LookupMixIn,
     # dictionary of locals with name as key and node defining the local as
     # value
 
+    def __setstate__(self, state):
+        # the names of the unpickled trees aren't shared with the other trees.
+        # They are interned in place, the locals of a module being its globals.
+        for field in ('locals', 'instance_attrs'):
+            if field in state:
+                names = state[field]
+                items = list(names.items())
+                names.clear()
+                names.update((util.intern_name(name), value) for name, value in items)
+        super(LocalsDictNodeNG, self).__setstate__(state)
+
     def qname(self):
         """return the 'qualified' name of the node, eg module.name,
         module.class.name ...
@@ -174,6 +187,12 @@ class LocalsDictNodeNG(node_classes.LookupMixIn,
             return pscope.scope_lookup(node, name)
         return builtin_lookup(name) # Module
 
+    def _reaching_definitions(self, node, stmts):
+        """return the statements from <stmts> reaching <node>, or None if
+        this scope has no control flow graph to tell it
+        """
+        return None
+
     def set_local(self, name, stmt):
         """define <name> in locals (<stmt> is the node defining the name)
         if the node is a Module node (i.e. has globals), add the name to
@@ -190,6 +209,12 @@ class LocalsDictNodeNG(node_classes.LookupMixIn,
         """append a child, linking it in the tree"""
         self.body.append(child)
         child.parent = self
+        # the control flow graph and the node index, if any, don't know
+        # about this child
+        self.__dict__.pop('cfg', None)
+        root = self.root()
+        if isinstance(root, Module):
+            root.invalidate_node_index()
 
     def add_local_node(self, child_node, name=None):
         """append a child which should alter locals to the given node"""
@@ -266,6 +291,10 @@ class Module(LocalsDictNodeNG):
     # Future imports
     future_imports = None
 
+    # index of the nodes of the module by class and by position, see
+    # node_index()
+    _node_index = None
+
     # names of python special attributes (handled by getattr impl.)
     special_attributes = set(('__name__', '__doc__', '__file__', '__path__',
                               '__dict__'))
@@ -338,6 +367,49 @@ class Module(LocalsDictNodeNG):
                 return self, ()
         return self._scope_lookup(node, name, offset)
 
+    def node_index(self):
+        """return the index of the nodes of this module, building it if
+        needed
+        """
+        if self._node_index is None:
+            self._node_index = node_index_mod.NodeIndex(self)
+        return self._node_index
+
+    def invalidate_node_index(self):
+        """throw away the index of the nodes of this module
+
+        This must be called when the tree is modified, the index will be
+        built again on the next query.
+        """
+        self._node_index = None
+
+    def node_at(self, lineno, col_offset):
+        """return the innermost node of this module at the given line and
+        column, or None if there is none
+        """
+        return self.node_index().node_at(lineno, col_offset)
+
+    def statements_in_range(self, fromlineno, tolineno):
+        """return the statements of this module having lines between the
+        given line numbers (included), in tree order
+        """
+        return self.node_index().statements_in_range(fromlineno, tolineno)
+
+    def nodes_by_type(self):
+        """return a dictionary mapping node classes to a tuple of the nodes
+        of this module which are instances of exactly that class, in tree
+        order
+        """
+        return dict(self.node_index().by_class)
+
+    @decorators_mod.cachedproperty
+    def cfg(self):
+        """the control flow graph of the module body"""
+        return flow.ControlFlowGraph(self)
+
+    def _reaching_definitions(self, node, stmts):
+        return self.cfg.reaching_definitions(node, stmts)
+
     def pytype(self):
         return '%s.module' % BUILTINS
 
@@ -822,8 +894,7 @@ class FunctionDef(node_classes.Statement, Lambda):
                 pass
         return type_name
 
-    @decorators_mod.cachedproperty
-    def fromlineno(self):
+    def _compute_fromlineno(self):
         # lineno is the line number of the first decorator, we want the def
         # statement lineno
         lineno = self.lineno
@@ -914,6 +985,14 @@ class FunctionDef(node_classes.Statement, Lambda):
         if pass_is_abstract:
             return True
 
+    @decorators_mod.cachedproperty
+    def cfg(self):
+        """the control flow graph of the function body"""
+        return flow.ControlFlowGraph(self)
+
+    def _reaching_definitions(self, node, stmts):
+        return self.cfg.reaching_definitions(node, stmts)
+
     def is_generator(self):
         """return true if this is a generator function"""
         yield_nodes = (node_classes.Yield, node_classes.YieldFrom)
@@ -1105,6 +1184,34 @@ class ClassDef(mixins.FilterStmtsMixin, LocalsDictNodeNG,
         if metaclass is not None:
             self._metaclass = metaclass
 
+    def __getattr__(self, name):
+        # the members of a class built lazily from a living class are only
+        # built when its locals or its body are first needed
+        if name in ('locals', 'body'):
+            build_members = self.__dict__.pop('_build_members', None)
+            if build_members is not None:
+                self.locals = {}
+                self.body = []
+                build_members(self)
+                return getattr(self, name)
+        raise AttributeError(name)
+
+    def __getstate__(self):
+        if '_build_members' in self.__dict__:
+            self.locals # pylint: disable=pointless-statement
+        return super(ClassDef, self).__getstate__()
+
+    def get_children(self):
+        if self.decorators is not None:
+            yield self.decorators
+        for elt in self.bases:
+            yield elt
+        # the members of a class built lazily aren't walked until they are
+        # built, see raw_building.InspectBuilder
+        if '_build_members' not in self.__dict__:
+            for elt in self.body:
+                yield elt
+
     def _newstyle_impl(self, context=None):
         if context is None:
             context = contextmod.InferenceContext()
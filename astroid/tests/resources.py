@@ -16,11 +16,14 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with astroid. If not, see <http://www.gnu.org/licenses/>.
 import os
+import shutil
 import sys
+import tempfile
 
 import pkg_resources
 
 from astroid import builder
+from astroid import disk_cache
 from astroid import MANAGER
 from astroid.bases import  BUILTINS
 
@@ -48,6 +51,29 @@ class SysPathSetup(object):
                 del sys.path_importer_cache[key]
 
 
+class DiskCacheSetupMixin(object):
+    """Mixin enabling the on-disk cache for the tests.
+
+    The cache is stored in self.cache_directory, in a temporary directory,
+    self.directory, which is removed after each test.
+    """
+
+    def setUp(self):
+        super(DiskCacheSetupMixin, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.directory, 'cache')
+        self._cache_environ = os.environ.get(disk_cache.ENVIRONMENT_VARIABLE)
+        os.environ[disk_cache.ENVIRONMENT_VARIABLE] = self.cache_directory
+
+    def tearDown(self):
+        if self._cache_environ is None:
+            os.environ.pop(disk_cache.ENVIRONMENT_VARIABLE, None)
+        else:
+            os.environ[disk_cache.ENVIRONMENT_VARIABLE] = self._cache_environ
+        shutil.rmtree(self.directory)
+        super(DiskCacheSetupMixin, self).tearDown()
+
+
 class AstroidCacheSetupMixin(object):
     """Mixin for handling the astroid cache problems.
 
@@ -15,17 +15,22 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with logilab-astng. If not, see <http://www.gnu.org/licenses/>.
 """Tests for basic functionality in astroid.brain."""
+import gc
+import os
 import sys
 import unittest
+import weakref
 
 import six
 
 from astroid import MANAGER
 from astroid import bases
+from astroid import brain
 from astroid import builder
 from astroid import nodes
 from astroid import test_utils
 from astroid import util
+from astroid.tests import resources
 import astroid
 
 
@@ -161,14 +166,178 @@ class NamedTupleTest(unittest.TestCase):
         inferred = next(node.infer())
         self.assertIs(util.Uninferable, inferred)
 
+    def test_namedtuple_synthesized_once(self):
+        first, second = test_utils.extract_node('''
+        from collections import namedtuple
+        namedtuple('Point', 'x y') #@
+        namedtuple('Point', ['x', 'y']) #@
+        ''')
+        inferred = next(first.infer())
+        self.assertIs(next(first.infer()), inferred)
+        other = next(second.infer())
+        self.assertIsNot(other, inferred)
+        self.assertIs(other.locals['_make'], inferred.locals['_make'])
+
+    def test_namedtuple_synthesized_freed_with_tree(self):
+        node = test_utils.extract_node('''
+        from collections import namedtuple
+        namedtuple('Point', 'x y') #@
+        ''', 'synthesized_freed')
+        next(node.infer())
+        module = weakref.ref(node.root())
+        MANAGER.astroid_cache.pop('synthesized_freed', None)
+        del node
+        gc.collect()
+        self.assertIsNone(module())
+
+    def test_namedtuple_templates_bounded(self):
+        from astroid.brain import brain_stdlib
+        templates = brain_stdlib._NAMEDTUPLE_TEMPLATES
+        self.addCleanup(setattr, brain_stdlib, 'MAX_NAMEDTUPLE_TEMPLATES',
+                        brain_stdlib.MAX_NAMEDTUPLE_TEMPLATES)
+        brain_stdlib.MAX_NAMEDTUPLE_TEMPLATES = 2
+        first, second, third, fourth = test_utils.extract_node('''
+        from collections import namedtuple
+        namedtuple('First', 'x') #@
+        namedtuple('Second', 'x') #@
+        namedtuple('First', 'x') #@
+        namedtuple('Third', 'x') #@
+        ''')
+        for node in (first, second, third, fourth):
+            next(node.infer())
+        # the first template was used again after the second one
+        self.assertEqual(list(templates),
+                         [('First', ('x', )), ('Third', ('x', ))])
+        self.assertIs(next(first.infer()).locals['_make'],
+                      next(third.infer()).locals['_make'])
+
+
+class LazyPluginsTest(unittest.TestCase):
+
+    def test_manifest_lists_existing_plugins(self):
+        brain_dir = os.path.dirname(brain.__file__)
+        for plugin in brain.LAZY_PLUGINS:
+            self.assertTrue(os.path.exists(os.path.join(brain_dir, plugin + '.py')))
+
+    def test_plugin_loaded_for_imported_module(self):
+        builder.parse('''
+        import dateutil.parser
+        ''')
+        self.assertIn('astroid.brain.brain_dateutil', sys.modules)
+        self.assertNotIn('dateutil', brain._PENDING)
+
+
+class GiStubCacheTest(resources.DiskCacheSetupMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(GiStubCacheTest, self).setUp()
+        from astroid.brain import brain_gi
+        self.brain_gi = brain_gi
+        typelib_dir = os.path.join(self.directory, 'girepository-1.0')
+        os.makedirs(typelib_dir)
+        self.typelib = os.path.join(typelib_dir, 'Fake-1.0.typelib')
+        open(self.typelib, 'w').close()
+        self._typelib_path = os.environ.get('GI_TYPELIB_PATH')
+        os.environ['GI_TYPELIB_PATH'] = typelib_dir
+        self._gi_modcode = brain_gi._gi_modcode
+        self.generated = []
+        def gi_modcode(modname, required_versions=None):
+            self.generated.append(modname)
+            return 'VALUE = 42\n'
+        brain_gi._gi_modcode = gi_modcode
+
+    def tearDown(self):
+        if self._typelib_path is None:
+            os.environ.pop('GI_TYPELIB_PATH', None)
+        else:
+            os.environ['GI_TYPELIB_PATH'] = self._typelib_path
+        self.brain_gi._gi_modcode = self._gi_modcode
+        self.brain_gi._inspected_modules.pop('gi.repository.Fake', None)
+        MANAGER.astroid_cache.pop('gi.repository.Fake', None)
+        super(GiStubCacheTest, self).tearDown()
+
+    def _import(self):
+        self.brain_gi._inspected_modules.pop('gi.repository.Fake', None)
+        MANAGER.astroid_cache.pop('gi.repository.Fake', None)
+        module = self.brain_gi._import_gi_module('gi.repository.Fake')
+        self.assertEqual(next(module['VALUE'].infer()).value, 42)
+
+    def test_stub_read_from_disk(self):
+        self._import()
+        self._import()
+        self.assertEqual(self.generated, ['gi.repository.Fake'])
+
+    def test_stub_generated_again_for_changed_typelib(self):
+        self._import()
+        os.utime(self.typelib, (0, 0))
+        self._import()
+        self.assertEqual(self.generated, ['gi.repository.Fake'] * 2)
+
+
+class StrBrainTest(unittest.TestCase):
+
+    def test_str_methods_of_new_builtins(self):
+        module = builder.parse('''
+        class str(object):
+            pass
+        ''', bases.BUILTINS)
+        upper = module['str']['upper']
+        self.assertIs(upper.parent, module['str'])
+        self.assertIsNot(upper, MANAGER.astroid_cache[bases.BUILTINS]['str']['upper'])
+        inferred = next(upper.infer_call_result(None))
+        self.assertIsInstance(inferred, nodes.Const)
+        self.assertEqual(inferred.value, '')
+
 
 class ModuleExtenderTest(unittest.TestCase):
     def testExtensionModules(self):
         transformer = MANAGER._transform
-        for extender, _ in transformer.transforms[nodes.Module]:
+        extenders = [extender for extender, _ in transformer.transforms[nodes.Module]]
+        for keyed in transformer.keyed_transforms[nodes.Module].values():
+            extenders.extend(extender for _, extender, _ in keyed)
+        self.assertTrue(extenders)
+        for extender in extenders:
             n = nodes.Module('__main__', None)
             extender(n)
 
+    def _register_extender(self, cache):
+        built = []
+        def extension():
+            built.append(True)
+            return builder.parse('def added(): pass')
+        astroid.register_module_extender(MANAGER, 'extended', extension, cache=cache)
+        self.addCleanup(MANAGER._transform.keyed_transforms[nodes.Module].pop, 'extended')
+        if cache:
+            self.addCleanup(MANAGER._clear_cache_hooks.pop)
+        return built
+
+    def test_extension_module_built_once(self):
+        built = self._register_extender(cache=True)
+        first = builder.parse('x = 1', 'extended')
+        second = builder.parse('x = 1', 'extended')
+        self.assertEqual(len(built), 1)
+        self.assertIs(first['added'], second['added'])
+        first.set_local('added', first['x'])
+        self.assertEqual(len(second.locals['added']), 1)
+
+    def test_extension_module_copied_with_cache(self):
+        built = self._register_extender(cache=True)
+        first = builder.parse('x = 1', 'extended')
+        # what clear_cache does, without bootstrapping the builtins again
+        MANAGER._clear_cache_hooks[-1]()
+        second = builder.parse('x = 1', 'extended')
+        third = builder.parse('x = 1', 'extended')
+        self.assertEqual(len(built), 1)
+        self.assertIsNot(first['added'], second['added'])
+        self.assertIs(second['added'], third['added'])
+        self.assertEqual(second['added'].name, 'added')
+
+    def test_extension_module_not_cached(self):
+        built = self._register_extender(cache=False)
+        builder.parse('x = 1', 'extended')
+        builder.parse('x = 1', 'extended')
+        self.assertEqual(len(built), 2)
+
 
 @unittest.skipUnless(HAS_NOSE, "This test requires nose library.")
 class NoseBrainTest(unittest.TestCase):
@@ -17,8 +17,10 @@
 # with astroid. If not, see <http://www.gnu.org/licenses/>.
 """tests for the astroid builder and rebuilder module"""
 
+import io
 import os
 import sys
+import tempfile
 import unittest
 
 import six
@@ -26,7 +28,9 @@ import six
 from astroid import builder
 from astroid import exceptions
 from astroid import manager
+from astroid import node_classes
 from astroid import nodes
+from astroid import rebuilder
 from astroid import test_utils
 from astroid import util
 from astroid.tests import resources
@@ -262,6 +266,54 @@ class BuilderTest(unittest.TestCase):
         with self.assertRaises(exceptions.AstroidSyntaxError):
             self.builder.string_build('"\\x1"')
 
+    def test_deeply_nested_expressions(self):
+        depth = sys.getrecursionlimit() * 2
+        module = self.builder.string_build(
+            'total = ' + ' - '.join(['a'] * depth) + '\n'
+            'attribute = a' + '.b' * depth + '\n')
+        binop = module.body[0].value
+        for _ in range(depth - 1):
+            self.assertIsInstance(binop, nodes.BinOp)
+            self.assertEqual(binop.op, '-')
+            self.assertIs(binop.left.parent, binop)
+            binop = binop.left
+        self.assertIsInstance(binop, nodes.Name)
+        self.assertEqual(module.body[0].tolineno, 1)
+        attribute = module.body[1].value
+        for _ in range(depth):
+            self.assertIsInstance(attribute, nodes.Attribute)
+            attribute = attribute.expr
+        self.assertIsInstance(attribute, nodes.Name)
+
+    def test_large_literal_containers(self):
+        size = rebuilder.LAZY_CONTAINER_SIZE
+        module = self.builder.string_build(
+            'table = [%s]\n' % ', '.join(['1', '"a"', 'None'] * size) +
+            'mapping = {%s}\n' % ', '.join('%d: "%d"' % (i, i) for i in range(size)) +
+            'names = (%s)\n' % ', '.join(['a'] * size))
+        table = module.body[0].value
+        mapping = module.body[1].value
+        names = module.body[2].value
+        self.assertIn('_constants', table.__dict__)
+        self.assertIn('_constants', mapping.__dict__)
+        self.assertNotIn('_constants', names.__dict__)
+        # the pending elements can only be constants
+        self.assertEqual(len(list(module.nodes_of_class(nodes.Name))), size)
+        self.assertIn('_constants', table.__dict__)
+        self.assertIsNotNone(module._node_index)
+        self.assertEqual(len(list(module.nodes_of_class(nodes.Const))),
+                         size * 5)
+        self.assertNotIn('_constants', table.__dict__)
+        self.assertEqual(len(table.elts), size * 3)
+        self.assertEqual([elt.value for elt in table.elts[:3]], [1, 'a', None])
+        self.assertIs(table.elts[1].parent, table)
+        self.assertEqual(table.elts[1].col_offset, 12)
+        self.assertEqual(mapping.getitem(42).value, '42')
+        self.assertNotIn('_constants', mapping.__dict__)
+        key, value = mapping.items[1]
+        self.assertEqual((key.value, value.value), (1, '1'))
+        self.assertEqual((key.lineno, value.lineno), (2, 2))
+
     def test_missing_newline(self):
         """check that a file with no trailing new line is parseable"""
         resources.build_file('data/noendingnewline.py')
@@ -723,6 +775,140 @@ class ModuleBuildTest(resources.SysPathSetup, FileBuildTest):
         else:
             self.module = abuilder.module_build(data.module, 'data.module')
 
+class SourceFileTest(unittest.TestCase):
+
+    def setUp(self):
+        descriptor, self.path = tempfile.mkstemp(suffix='.py')
+        os.close(descriptor)
+        self.addCleanup(os.remove, self.path)
+
+    def _build(self, file_bytes):
+        with open(self.path, 'wb') as stream:
+            stream.write(file_bytes)
+        return builder.AstroidBuilder().file_build(self.path, 'source')
+
+    def test_file_bytes_kept(self):
+        file_bytes = b'# -*- coding: utf-8 -*-\r\nname = "\xc3\xa9t\xc3\xa9"\r\n'
+        module = self._build(file_bytes)
+        self.assertEqual(module.file_encoding, 'utf-8')
+        self.assertEqual(module['name'].lineno, 2)
+        with open(self.path, 'wb') as stream:
+            stream.write(b'')
+        with module.stream() as stream:
+            self.assertEqual(stream.read(), file_bytes)
+
+    def test_open_source_file(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'# -*- coding: utf-8 -*-\r\nname = 1\r\n')
+        stream, encoding, data = builder.open_source_file(self.path)
+        with stream:
+            self.assertEqual(encoding.lower(), 'utf-8')
+            self.assertEqual(data, '# -*- coding: utf-8 -*-\nname = 1\n')
+            self.assertFalse(isinstance(stream, io.BytesIO))
+
+    @unittest.skipUnless(six.PY3, "sources aren't decoded on Python 2")
+    def test_wrong_encoding(self):
+        with self.assertRaises(exceptions.AstroidBuildingError):
+            self._build(b'# -*- coding: utf-8 -*-\nname = "\xe9"\n')
+
+
+class IncrementalBuildTest(unittest.TestCase):
+
+    code = (
+        'CONSTANT = 1\n'
+        '\n'
+        'class A(object):\n'
+        '    def __init__(self):\n'
+        '        self.attr = CONSTANT\n'
+        '    def method(self):\n'
+        '        return CONSTANT\n'
+        '\n'
+        'def function():\n'
+        '    return [A() for _ in range(2)]\n'
+    )
+
+    def setUp(self):
+        self.builder = builder.AstroidBuilder()
+
+    def _build(self, code):
+        return self.builder.string_build(code, 'incremental')
+
+    def _assert_same_tree(self, module, expected):
+        found = [(node.__class__, node.lineno, node.col_offset, node.fromlineno,
+                  node.tolineno)
+                 for node in module.nodes_of_class(node_classes.NodeNG)]
+        self.assertEqual(found, [(node.__class__, node.lineno, node.col_offset,
+                                  node.fromlineno, node.tolineno)
+                                 for node in expected.nodes_of_class(node_classes.NodeNG)])
+        self.assertEqual(module.as_string(), expected.as_string())
+        self.assertEqual(sorted(module.locals), sorted(expected.locals))
+
+    def test_unchanged_definitions_reused(self):
+        previous = self._build(self.code)
+        klass, function = previous['A'], previous['function']
+        self.assertEqual(klass.tolineno, 7)
+        code = ('import os\n\n' + self.code).replace('range(2)', 'range(3)')
+        module = self.builder.incremental_build(previous, code)
+        self.assertIs(module['A'], klass)
+        self.assertIsNot(module['function'], function)
+        self.assertIs(klass.parent, module)
+        self.assertEqual((klass.lineno, klass.tolineno), (5, 9))
+        self.assertEqual(module.node_index().lines(klass), (5, 9))
+        self.assertEqual(len(klass.instance_attrs['attr']), 1)
+        self._assert_same_tree(module, self._build(code))
+
+    def test_reused_definitions_infer_from_new_module(self):
+        previous = self._build(self.code)
+        method = previous['A']['method']
+        self.assertEqual(next(method.infer_call_result(None)).value, 1)
+        code = self.code.replace('CONSTANT = 1', 'CONSTANT = 2')
+        module = self.builder.incremental_build(previous, code)
+        self.assertIs(module['A']['method'], method)
+        self.assertEqual(next(method.infer_call_result(None)).value, 2)
+
+    def test_reused_definitions_not_transformed_again(self):
+        transformed = []
+        manager = self.builder._manager
+        manager.register_transform(nodes.FunctionDef, transformed.append)
+        self.addCleanup(manager.unregister_transform, nodes.FunctionDef,
+                        transformed.append)
+        previous = self._build(self.code)
+        self.assertEqual(len(transformed), 3)
+        del transformed[:]
+        code = self.code.replace('range(2)', 'range(3)')
+        module = self.builder.incremental_build(previous, code)
+        self.assertEqual(transformed, [module['function']])
+
+    def test_global_declarations_rebuilt(self):
+        code = self.code + 'def setter():\n    global VALUE\n    VALUE = 1\n'
+        previous = self._build(code)
+        setter = previous['setter']
+        module = self.builder.incremental_build(previous, code)
+        self.assertIs(module['A'], previous['A'])
+        self.assertIsNot(module['setter'], setter)
+        self.assertIn('VALUE', module.locals)
+
+    def test_reused_classes_see_new_ancestors(self):
+        code = 'class Base:\n    pass\n\nclass Derived(Base):\n    pass\n'
+        previous = self._build(code)
+        derived = previous['Derived']
+        self.assertEqual(derived.newstyle, six.PY3)
+        self.assertEqual(derived.type, 'class')
+        code = code.replace('class Base:', 'class Base(Exception):')
+        module = self.builder.incremental_build(previous, code)
+        self.assertIs(module['Derived'], derived)
+        self.assertTrue(derived.newstyle)
+        self.assertEqual(derived.type, 'exception')
+        self.assertEqual(derived.newstyle, self._build(code)['Derived'].newstyle)
+
+    def test_source_not_kept(self):
+        previous = self._build(self.code)
+        previous.file_bytes = None
+        module = self.builder.incremental_build(previous, self.code)
+        self.assertIsNot(module['A'], previous['A'])
+        self._assert_same_tree(module, self._build(self.code))
+
+
 @unittest.skipIf(six.PY3, "guess_encoding not used on Python 3")
 class TestGuessEncoding(unittest.TestCase):
     def setUp(self):
@@ -23,6 +23,7 @@ import unittest
 
 from astroid import builder
 from astroid import exceptions
+from astroid import flow
 from astroid import nodes
 from astroid import scoped_nodes
 from astroid import test_utils
@@ -347,5 +348,141 @@ class LookupTest(resources.SysPathSetup, unittest.TestCase):
         self.assertEqual(len(stmts), 0)
 
 
+class ControlFlowLookupTest(unittest.TestCase):
+
+    def _lookup_lines(self, code):
+        node = test_utils.extract_node(code, __name__)
+        return [stmt.lineno for stmt in node.lookup(node.name)[1]]
+
+    def test_assignment_later_in_loop(self):
+        code = '''
+            def func(seq):
+                x = 1
+                for _ in seq:
+                    x #@
+                    x = 2
+        '''
+        self.assertEqual(self._lookup_lines(code), [3, 6])
+
+    def test_loop_variable_after_empty_loop(self):
+        code = '''
+            def func(seq):
+                x = 1
+                for x in seq:
+                    pass
+                x #@
+        '''
+        self.assertEqual(self._lookup_lines(code), [3, 4])
+
+    def test_deleted_in_branch(self):
+        code = '''
+            def func(a):
+                x = 1
+                if a:
+                    del x
+                else:
+                    x = 2
+                x #@
+        '''
+        self.assertEqual(self._lookup_lines(code), [7])
+
+    def test_try_except(self):
+        code = '''
+            def func():
+                x = 1
+                try:
+                    x = 2
+                    x = 3
+                except ValueError:
+                    x #@
+        '''
+        self.assertEqual(self._lookup_lines(code), [3, 5, 6])
+
+    def test_return_in_branch(self):
+        code = '''
+            def func(a):
+                x = 1
+                if a:
+                    x = 2
+                    return
+                x #@
+        '''
+        self.assertEqual(self._lookup_lines(code), [3])
+
+    def test_break_through_finally(self):
+        code = '''
+            def func(seq):
+                x = 1
+                while seq:
+                    try:
+                        break
+                    finally:
+                        x = 2
+                x #@
+        '''
+        self.assertEqual(self._lookup_lines(code), [3, 8])
+
+    def test_same_statement(self):
+        code = '''
+            def func():
+                x = 1
+                x = x + 1 #@
+        '''
+        node = test_utils.extract_node(code, __name__)
+        name = node.value.left
+        self.assertEqual([stmt.lineno for stmt in name.lookup('x')[1]], [3])
+
+    def test_unreachable_statement(self):
+        module = builder.parse('''
+            def func():
+                return
+                x = 1
+                x
+        ''', __name__)
+        func = module['func']
+        name = func.body[-1].value
+        self.assertIsNone(func.cfg.reaching_definitions(name, func.locals['x']))
+        self.assertEqual(len(name.lookup('x')[1]), 1)
+
+    def test_names_solved_at_once(self):
+        count = 500
+        module = builder.parse(
+            ''.join('x%d = 1\nx%d = 2\n' % (i, i) for i in range(count))
+            + ''.join('x%d\n' % i for i in range(count)), __name__)
+        solved = []
+        original = flow.ControlFlowGraph._solve
+
+        def solve(cfg):
+            solved.append(cfg)
+            return original(cfg)
+
+        flow.ControlFlowGraph._solve = solve
+        try:
+            for expr in module.body[count * 2:]:
+                stmts = expr.value.lookup(expr.value.name)[1]
+                self.assertEqual([stmt.lineno for stmt in stmts],
+                                 [int(expr.value.name[1:]) * 2 + 2])
+        finally:
+            flow.ControlFlowGraph._solve = original
+        self.assertEqual(solved, [module.cfg])
+
+    def test_large_frame_not_solved(self):
+        module = builder.parse('''
+            x = 1
+            if x:
+                x = 2
+            x
+        ''', __name__)
+        name = module.body[-1].value
+        original = flow.MAX_SOLVED_SIZE
+        flow.MAX_SOLVED_SIZE = 1
+        try:
+            self.assertIsNone(module.cfg.reaching_definitions(name, module.locals['x']))
+        finally:
+            flow.MAX_SOLVED_SIZE = original
+        # the line numbers of the statements are used instead
+        self.assertEqual([stmt.lineno for stmt in name.lookup('x')[1]], [2, 4])
+
+
 if __name__ == '__main__':
     unittest.main()
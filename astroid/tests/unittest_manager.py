@@ -15,15 +15,24 @@
 #
 # You should have received a copy of the GNU Lesser General Public License along
 # with astroid. If not, see <http://www.gnu.org/licenses/>.
+import imp
 import os
 import platform
+import shutil
 import sys
+import tempfile
+import textwrap
+import time
 import unittest
 
 import six
 
+from astroid import builder
 from astroid import exceptions
+from astroid import introspection
 from astroid import manager
+from astroid import modutils
+from astroid import nodes
 from astroid.tests import resources
 
 
@@ -196,7 +205,222 @@ class AstroidManagerTest(resources.SysPathSetup,
         self.assertEqual(unittest, self.manager.ast_from_module_name('foo.bar'))
         with self.assertRaises(exceptions.AstroidBuildingError):
             self.manager.ast_from_module_name('foo.bar.baz')
-        del self.manager._failed_import_hooks[0]
+        self.manager._failed_import_hooks.remove(hook)
+
+
+class ExtensionCacheTest(resources.DiskCacheSetupMixin,
+                         resources.AstroidCacheSetupMixin,
+                         unittest.TestCase):
+
+    def setUp(self):
+        self.manager = manager.AstroidManager()
+        filepath, mp_type = self.manager.file_from_module_name('_csv', None)
+        if mp_type != imp.C_EXTENSION:
+            self.skipTest('_csv is not a compiled extension module')
+        super(ExtensionCacheTest, self).setUp()
+        self.manager.astroid_cache.pop('_csv', None)
+
+    def tearDown(self):
+        self.manager.astroid_cache.pop('_csv', None)
+        super(ExtensionCacheTest, self).tearDown()
+
+    def test_extension_loaded_from_cache(self):
+        built = self.manager.ast_from_module_name('_csv')
+        entries = os.listdir(os.path.join(self.cache_directory, 'extensions'))
+        self.assertEqual(len(entries), 1)
+        self.manager.astroid_cache.pop('_csv')
+
+        def load_module_from_name(modname):
+            raise AssertionError('%s should not be imported' % modname)
+        original = modutils.load_module_from_name
+        modutils.load_module_from_name = load_module_from_name
+        try:
+            loaded = self.manager.ast_from_module_name('_csv')
+        finally:
+            modutils.load_module_from_name = original
+        self.assertIsNot(loaded, built)
+        self.assertIs(self.manager.astroid_cache['_csv'], loaded)
+        self.assertEqual(sorted(loaded.locals), sorted(built.locals))
+        self.assertEqual(loaded['QUOTE_ALL'].value, built['QUOTE_ALL'].value)
+
+    def test_living_objects_looked_up_by_name(self):
+        def living_objects(module):
+            return dict(((node.parent.name, node.name), node.object)
+                        for node in module.nodes_of_class(nodes.EmptyNode)
+                        if node.has_underlying_object())
+        built = self.manager.ast_from_module_name('_csv')
+        expected = living_objects(built)
+        self.assertTrue(expected)
+        self.manager.astroid_cache.pop('_csv')
+        loaded = self.manager.ast_from_module_name('_csv')
+        self.assertEqual(living_objects(loaded), expected)
+
+    def test_living_objects_kept_on_other_attributes(self):
+        self.manager.ast_from_module_name('_csv')
+        self.manager.astroid_cache.pop('_csv')
+        loaded = self.manager.ast_from_module_name('_csv')
+        node = next(node for node in loaded.nodes_of_class(nodes.EmptyNode)
+                    if '_object_reference' in node.__dict__)
+        self.assertIsNone(getattr(node, 'func', None))
+        self.assertTrue(node.has_underlying_object())
+
+    def test_unresolved_living_objects(self):
+        self.manager.ast_from_module_name('_csv')
+        self.manager.astroid_cache.pop('_csv')
+        loaded = self.manager.ast_from_module_name('_csv')
+        node = next(node for node in loaded.nodes_of_class(nodes.EmptyNode)
+                    if '_object_reference' in node.__dict__)
+        node._object_reference.names.append('missing')
+        self.assertFalse(node.has_underlying_object())
+        self.assertFalse(hasattr(node, 'object'))
+
+
+class StubFileTest(resources.AstroidCacheSetupMixin, unittest.TestCase):
+
+    def setUp(self):
+        self.manager = manager.AstroidManager()
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, '_csv.pyi'), 'w') as stream:
+            stream.write('QUOTE_ALL = 1\n'
+                         'def reader(csvfile, dialect=\'excel\', **fmtparams):\n'
+                         '    pass\n')
+        self.manager.stub_path.append(self.directory)
+        self.manager.astroid_cache.pop('_csv', None)
+
+    def tearDown(self):
+        self.manager.stub_path.remove(self.directory)
+        shutil.rmtree(self.directory)
+        self.manager.astroid_cache.pop('_csv', None)
+
+    def test_stub_preferred_over_import(self):
+        def load_module_from_name(modname):
+            raise AssertionError('%s should not be imported' % modname)
+        original = modutils.load_module_from_name
+        modutils.load_module_from_name = load_module_from_name
+        try:
+            module = self.manager.ast_from_module_name('_csv')
+        finally:
+            modutils.load_module_from_name = original
+        self.assertEqual(module.file, os.path.join(self.directory, '_csv.pyi'))
+        self.assertEqual(sorted(module.locals), ['QUOTE_ALL', 'reader'])
+        self.assertEqual(module['reader'].argnames(), ['csvfile', 'dialect', 'fmtparams'])
+
+
+class RetentionPolicyTest(unittest.TestCase):
+
+    CODE = '''
+        """module docstring"""
+        class Klass(object):
+            """class docstring"""
+            def method(self):
+                """method docstring"""
+    '''
+
+    def setUp(self):
+        self.manager = manager.AstroidManager()
+        self.manager.set_retention_policy('retained', docstrings=manager.DROP,
+                                          source=manager.OMIT)
+        self.manager.set_retention_policy('retained.kept')
+
+    def tearDown(self):
+        del self.manager.retention_policies['retained']
+        del self.manager.retention_policies['retained.kept']
+        for modname in ('retained.module', 'retained.kept.module', 'omitted'):
+            self.manager.astroid_cache.pop(modname, None)
+
+    def _build(self, modname):
+        return builder.AstroidBuilder(self.manager).string_build(
+            textwrap.dedent(self.CODE), modname)
+
+    def test_retention_policy(self):
+        self.assertEqual(self.manager.retention_policy('retained.module'),
+                         (manager.DROP, manager.OMIT))
+        self.assertEqual(self.manager.retention_policy('retained.kept.module'),
+                         (manager.KEEP, manager.KEEP))
+        self.assertEqual(self.manager.retention_policy('retainedmodule'),
+                         (manager.KEEP, manager.KEEP))
+        with self.assertRaises(ValueError):
+            self.manager.set_retention_policy('retained', docstrings='lost')
+
+    def test_docstrings_and_source_dropped(self):
+        module = self._build('retained.module')
+        self.assertIsNone(module.doc)
+        self.assertIsNone(module['Klass'].doc)
+        self.assertIsNone(module['Klass']['method'].doc)
+        self.assertIsNone(module.file_bytes)
+        module = self._build('retained.kept.module')
+        self.assertEqual(module.doc, 'module docstring')
+        self.assertEqual(module['Klass']['method'].doc, 'method docstring')
+        self.assertIsNotNone(module.file_bytes)
+
+    def test_docstrings_omitted(self):
+        docstrings = []
+        def transform(node):
+            docstrings.append(node.doc)
+        self.manager.register_transform(nodes.ClassDef, transform)
+        self.manager.set_retention_policy('omitted', docstrings=manager.OMIT,
+                                          source=manager.DROP)
+        try:
+            module = self._build('omitted')
+        finally:
+            self.manager.unregister_transform(nodes.ClassDef, transform)
+            del self.manager.retention_policies['omitted']
+        self.assertEqual(docstrings, [None])
+        self.assertIsNone(module.doc)
+        self.assertIsNone(module.file_bytes)
+
+
+class IntrospectionProcessTest(resources.AstroidCacheSetupMixin,
+                               unittest.TestCase):
+
+    def setUp(self):
+        self.manager = manager.AstroidManager()
+        if 'audioop' in sys.modules:
+            self.skipTest('audioop is already imported')
+        filepath, mp_type = self.manager.file_from_module_name('audioop', None)
+        if mp_type != imp.C_EXTENSION:
+            self.skipTest('audioop is not a compiled extension module')
+        self.manager.introspection_processes = 1
+        self.manager.astroid_cache.pop('audioop', None)
+
+    def tearDown(self):
+        self.manager.introspection_processes = 0
+        self.manager.introspection_pool().close()
+        self.manager.astroid_cache.pop('audioop', None)
+
+    def test_module_introspected_by_helper_process(self):
+        module = self.manager.ast_from_module_name('audioop')
+        self.assertNotIn('audioop', sys.modules)
+        self.assertIs(self.manager.astroid_cache['audioop'], module)
+        self.assertIsInstance(module['error'], nodes.ClassDef)
+        self.assertIsInstance(module['add'], nodes.FunctionDef)
+
+    def test_import_error(self):
+        pool = self.manager.introspection_pool()
+        with self.assertRaises(ImportError):
+            pool.build_module('unexisting_module')
+
+    def test_build_modules_in_parallel(self):
+        pool = self.manager.introspection_pool()
+        trees = pool.build_modules(['audioop', 'unexisting_module'])
+        self.assertEqual(list(trees), ['audioop'])
+        self.assertEqual(trees['audioop'].name, 'audioop')
+        self.assertNotIn('audioop', sys.modules)
+
+    def test_helper_process_timeout(self):
+        self.manager.introspection_timeout = 0.1
+        self.addCleanup(setattr, self.manager, 'introspection_timeout', 60)
+        pool = self.manager.introspection_pool()
+        with self.assertRaises(introspection.IntrospectionTimeout):
+            pool.apply(time.sleep, 10)
+        self.assertEqual(pool.apply(abs, -1), 1)
+
+    def test_import_fails_on_timeout(self):
+        self.manager.introspection_timeout = 0
+        self.addCleanup(setattr, self.manager, 'introspection_timeout', 60)
+        with self.assertRaises(exceptions.AstroidImportError):
+            self.manager.ast_from_module_name('audioop')
+        self.assertNotIn('audioop', sys.modules)
 
 
 class BorgAstroidManagerTC(unittest.TestCase):
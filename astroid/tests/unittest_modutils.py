@@ -19,7 +19,9 @@
 unit tests for module modutils (module manipulation utilities)
 """
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 
 from astroid import modutils
@@ -170,6 +172,38 @@ class GetSourceFileTest(unittest.TestCase):
         self.assertRaises(modutils.NoSourceFile, modutils.get_source_file, 'whatever')
 
 
+class GetStubFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _touch(self, *parts):
+        path = os.path.join(self.directory, *parts)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        open(path, 'w').close()
+        return path
+
+    def test_next_to_module(self):
+        extension = self._touch('pkg', 'ext.so')
+        stub = self._touch('pkg', 'ext.pyi')
+        self.assertEqual(modutils.get_stub_file('pkg.ext', extension), stub)
+
+    def test_stub_path(self):
+        module = self._touch('stubs', 'a', 'b.pyi')
+        package = self._touch('stubs', 'a', 'c', '__init__.pyi')
+        stub_path = [os.path.join(self.directory, 'stubs')]
+        self.assertEqual(modutils.get_stub_file('a.b', None, stub_path), module)
+        self.assertEqual(modutils.get_stub_file('a.c', None, stub_path), package)
+
+    def test_no_stub(self):
+        extension = self._touch('ext.so')
+        self.assertIsNone(modutils.get_stub_file('ext', extension, [self.directory]))
+
+
 class StandardLibModuleTest(resources.SysPathSetup, unittest.TestCase):
     """
     return true if the module may be considered as a module from the standard
@@ -449,6 +449,41 @@ class ConstNodeTest(unittest.TestCase):
         self._test(u'a')
 
 
+class DictNodeTest(unittest.TestCase):
+
+    def test_getitem(self):
+        module = builder.parse('''
+            KEY = 'b'
+            mapping = {'a': 1, KEY: 2, 'b': 3, 'a': 4, 5.0: 5}
+        ''')
+        mapping = module.body[1].value
+        self.assertEqual(mapping.getitem('a').value, 1)
+        self.assertEqual(mapping.getitem('b').value, 2)
+        self.assertEqual(mapping.getitem(5).value, 5)
+        self.assertRaises(IndexError, mapping.getitem, 'c')
+        self.assertRaises(IndexError, mapping.getitem, [])
+        mapping.postinit(mapping.items[2:])
+        self.assertEqual(mapping.getitem('b').value, 3)
+        self.assertEqual(mapping.getitem('a').value, 4)
+
+    def test_getitem_dict_unpacking(self):
+        if sys.version_info < (3, 5):
+            self.skipTest('needs PEP 448')
+        module = builder.parse('''
+            mapping = {'a': 1, **{'b': 2}, 'b': 3}
+        ''')
+        mapping = module.body[0].value
+        self.assertEqual(mapping.getitem('a').value, 1)
+        self.assertEqual(mapping.getitem('b').value, 2)
+
+    def test_subscript_inference(self):
+        node = test_utils.extract_node('''
+            CONFIG = {%s}
+            CONFIG['key500'] #@
+        ''' % ', '.join('"key%d": %d' % (i, i) for i in range(1000)))
+        self.assertEqual(next(node.infer()).value, 500)
+
+
 class NameNodeTest(unittest.TestCase):
     def test_assign_to_True(self):
         """test that True and False assignements don't crash"""
@@ -808,5 +843,82 @@ class ContextTest(unittest.TestCase):
         
         
 
+class NodeIndexTest(unittest.TestCase):
+
+    CODE = '''
+        def func(a):
+            def inner():
+                return a
+            return [a(b) for b in inner()]
+
+        class A(object):
+            def method(self):
+                return func(self)
+            attr = func(1)
+    '''
+
+    def test_nodes_of_class_matches_walk(self):
+        module = parse(self.CODE)
+        skip_klasses = (None, nodes.FunctionDef, (nodes.FunctionDef, nodes.ClassDef))
+        for node in [module, module['func'], module['A'], module['A']['method']]:
+            for klass in (nodes.Name, nodes.Call, (nodes.Return, nodes.Call)):
+                for skip_klass in skip_klasses:
+                    self.assertEqual(
+                        list(node.nodes_of_class(klass, skip_klass)),
+                        list(node._walk_nodes_of_class(klass, skip_klass)))
+
+    def test_nodes_by_type(self):
+        module = parse(self.CODE)
+        by_type = module.nodes_by_type()
+        self.assertEqual([node.lineno for node in by_type[nodes.Return]],
+                         [4, 5, 9])
+        self.assertNotIn(nodes.Lambda, by_type)
+
+    def test_index_invalidated_by_transforms(self):
+        module = parse(self.CODE, apply_transforms=False)
+        self.assertEqual(len(list(module.nodes_of_class(nodes.Return))), 3)
+
+        def transform_function(node):
+            node.body.append(nodes.Return(parent=node))
+
+        visitor = transforms.TransformVisitor()
+        visitor.register_transform(nodes.FunctionDef, transform_function)
+        visitor.visit(module)
+        self.assertEqual(len(list(module.nodes_of_class(nodes.Return))), 6)
+
+    def test_lines_match_node_attributes(self):
+        for module in (parse(self.CODE),
+                       resources.build_file('data/format.py'),
+                       resources.build_file('data/module.py', 'data.module'),
+                       resources.build_file('data/module2.py', 'data.module2')):
+            node_index = module.node_index()
+            for node in node_index.nodes:
+                self.assertEqual(node_index.lines(node),
+                                 (node.fromlineno, node.tolineno), node)
+                self.assertEqual(node_index.lines(node),
+                                 (node._compute_fromlineno(),
+                                  node._compute_tolineno()), node)
+                self.assertNotIn('fromlineno', node.__dict__)
+                self.assertNotIn('tolineno', node.__dict__)
+        self.assertIsNone(node_index.lines(nodes.Pass()))
+
+    def test_lines_read_from_rebuilt_index(self):
+        module = parse(self.CODE)
+        function = next(module.nodes_of_class(nodes.FunctionDef))
+        module.invalidate_node_index()
+        self.assertIsNone(module._node_index)
+        lines = function.fromlineno, function.tolineno
+        self.assertIsNotNone(module._node_index)
+        self.assertEqual(lines, (function._compute_fromlineno(),
+                                 function._compute_tolineno()))
+
+    def test_lines_of_lazy_container(self):
+        module = parse('table = [\n' + '    1,\n' * 1000 + ']\n')
+        table = module.body[0].value
+        self.assertEqual(module.node_index().lines(table), (1, 1001))
+        self.assertIn('_constants', table.__dict__)
+        self.assertEqual(table.tolineno, 1001)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -22,6 +22,8 @@ import ast
 import textwrap
 import unittest
 
+import six
+
 import astroid
 from astroid import astpeephole
 from astroid import builder
@@ -102,6 +104,66 @@ class PeepholeOptimizer(unittest.TestCase):
         self.assertIsInstance(element, astroid.Const)
         self.assertEqual(len(element.value), 61660)
 
+    def test_constant_folding(self):
+        module = builder.parse("""
+        a = 2 * 3 + 4 ** 2 - -1
+        b = 'ab' * 2 + 'c'
+        c = 1 < 2 < 3 == 3.0
+        d = not 0
+        e = 0 or '' or 'x'
+        f = 1 and 0 and 2
+        g = 1 // 0
+        h = 1 < 'a'
+        i = 1 + x
+        """)
+        expected = {'a': 23, 'b': 'ababc', 'c': True, 'd': True, 'e': 'x', 'f': 0}
+        for name, value in expected.items():
+            node = module[name].parent.value
+            self.assertIsInstance(node, astroid.Const)
+            self.assertEqual(node.value, value)
+            self.assertIs(node.parent, module[name].parent)
+        self.assertIsInstance(module['g'].parent.value, astroid.BinOp)
+        if six.PY3:
+            self.assertIsInstance(module['h'].parent.value, astroid.Compare)
+        self.assertIsInstance(module['i'].parent.value, astroid.BinOp)
+
+    def test_constant_folding_bounded(self):
+        module = builder.parse("""
+        big_int = 2 ** 100000
+        big_str = 'a' * 100000
+        format = '%100000s' % 'a'
+        huge_float = 1e308 * 10
+        """)
+        self.assertIsInstance(module['big_int'].parent.value, astroid.BinOp)
+        self.assertIsInstance(module['big_str'].parent.value, astroid.BinOp)
+        self.assertIsInstance(module['format'].parent.value, astroid.BinOp)
+        self.assertIsInstance(module['huge_float'].parent.value, astroid.BinOp)
+
+    def test_chains_flattened(self):
+        module = builder.parse("""
+        items = [a] + [1, b] + [c()]
+        pair = (a, ) + (b, )
+        mixed = [a] + (b, )
+        either = a or (b or c) or (d and e)
+        """)
+        items = module['items'].parent.value
+        self.assertIsInstance(items, astroid.List)
+        self.assertEqual(items.as_string(), '[a, 1, b, c()]')
+        self.assertTrue(all(elt.parent is items for elt in items.elts))
+        self.assertIs(items.parent, module['items'].parent)
+        self.assertIsInstance(module['pair'].parent.value, astroid.Tuple)
+        self.assertIsInstance(module['mixed'].parent.value, astroid.BinOp)
+        either = module['either'].parent.value
+        self.assertEqual(len(either.values), 4)
+        self.assertTrue(all(value.parent is either for value in either.values))
+        self.assertIsInstance(either.values[3], astroid.BoolOp)
+
+    def test_long_chains_flattened(self):
+        module = builder.parse('items = ' + ' + '.join(['[x]'] * 3000) + '\n'
+                               'condition = ' + ' or '.join(['(x or y)'] * 3000))
+        self.assertEqual(len(module['items'].parent.value.elts), 3000)
+        self.assertEqual(len(module['condition'].parent.value.values), 6000)
+
     def test_optimisation_disabled(self):
         try:
             MANAGER.optimize_ast = False
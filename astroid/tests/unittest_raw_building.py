@@ -1,17 +1,25 @@
 import inspect
 import os
+import types
 import unittest
 
+import six
 from six.moves import builtins # pylint: disable=import-error
+from six.moves import cPickle as pickle
 
 from astroid.builder import AstroidBuilder
+from astroid import builder
 from astroid.raw_building import (
     attach_dummy_node, build_module,
     build_class, build_function, build_from_import
 )
+from astroid import disk_cache
+from astroid import raw_building
 from astroid import test_utils
 from astroid import nodes
+from astroid import MANAGER
 from astroid.bases import BUILTINS
+from astroid.tests import resources
 
 
 class RawBuildingTC(unittest.TestCase):
@@ -50,6 +58,32 @@ class RawBuildingTC(unittest.TestCase):
         node = build_function('MyFunction', None, defaults)
         self.assertEqual(2, len(node.args.defaults))
 
+    def test_names_interned(self):
+        name = ''.join(['My', 'Function'])
+        arg = ''.join(['my', 'Arg'])
+        node = build_function(name, [arg])
+        self.assertIs(node.name, six.moves.intern('MyFunction'))
+        self.assertIs(node.args.args[0].name, six.moves.intern('myArg'))
+
+    def test_unpickled_names_interned(self):
+        module = builder.parse('''
+            class MyClass(object):
+                def my_method(self):
+                    self.my_attribute = 42
+        ''')
+        module = pickle.loads(pickle.dumps(module, pickle.HIGHEST_PROTOCOL))
+        klass = module['MyClass']
+        self.assertIs(klass.name, six.moves.intern('MyClass'))
+        for name in (list(module.locals) + list(klass.locals) +
+                     list(klass.instance_attrs)):
+            self.assertIs(name, six.moves.intern(name))
+        self.assertEqual(sorted(klass.instance_attrs), ['my_attribute'])
+
+    def test_unpickled_module_globals(self):
+        module = builder.parse('name = 42')
+        module = pickle.loads(pickle.dumps(module, pickle.HIGHEST_PROTOCOL))
+        self.assertIs(module.locals, module.globals)
+
     def test_build_from_import(self):
         names = ['exceptions, inference, inspector']
         node = build_from_import('astroid', names)
@@ -81,5 +115,104 @@ class RawBuildingTC(unittest.TestCase):
             self.assertEqual(inferred.root().name, BUILTINS, name)
 
 
+class LazyInspectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.module = types.ModuleType('lazymod')
+        class Outer(object):
+            value = 42
+            class Inner(object):
+                other = 24
+        Outer.__module__ = Outer.Inner.__module__ = 'lazymod'
+        self.module.Outer = Outer
+        MANAGER.lazy_inspection = True
+
+    def tearDown(self):
+        MANAGER.lazy_inspection = False
+        MANAGER.astroid_cache.pop('lazymod', None)
+
+    def test_members_built_on_first_access(self):
+        module = AstroidBuilder().inspect_build(self.module)
+        outer = module['Outer']
+        self.assertIn('_build_members', outer.__dict__)
+        self.assertEqual([node.name for node in module.nodes_of_class(nodes.ClassDef)],
+                         ['Outer'])
+        self.assertEqual(outer['value'].value, 42)
+        self.assertNotIn('_build_members', outer.__dict__)
+        inner = outer['Inner']
+        self.assertIs(inner.parent, outer)
+        self.assertEqual(inner.getattr('other')[0].value, 24)
+        self.assertIn(inner, list(module.nodes_of_class(nodes.ClassDef)))
+
+    def test_lazy_members_are_transformed(self):
+        def transform(node):
+            node.value = node.value + 1
+        def predicate(node):
+            return node.value == 42
+        MANAGER.register_transform(nodes.Const, transform, predicate)
+        try:
+            module = builder.AstroidBuilder().module_build(self.module)
+            self.assertEqual(module['Outer']['value'].value, 43)
+        finally:
+            MANAGER.unregister_transform(nodes.Const, transform, predicate)
+
+    def test_module_keeps_its_classes(self):
+        class Base(object):
+            pass
+        class Derived(Base):
+            base = Base
+        Base.__module__ = Derived.__module__ = 'lazymod'
+        self.module.Base = Base
+        self.module.Derived = Derived
+        module = AstroidBuilder().inspect_build(self.module)
+        base = module['Base']
+        self.assertIs(module['Derived']['base'], base)
+        self.assertIs(base.parent, module)
+        self.assertEqual(base.qname(), 'lazymod.Base')
+
+
+class BuiltinsSnapshotTest(resources.DiskCacheSetupMixin, unittest.TestCase):
+
+    def setUp(self):
+        super(BuiltinsSnapshotTest, self).setUp()
+        self._snapshot = raw_building._BUILTINS_SNAPSHOT
+        self._builtins = MANAGER.astroid_cache.get(BUILTINS)
+        raw_building._BUILTINS_SNAPSHOT = None
+
+    def tearDown(self):
+        raw_building._BUILTINS_SNAPSHOT = self._snapshot
+        if self._builtins is None:
+            MANAGER.astroid_cache.pop(BUILTINS, None)
+        else:
+            MANAGER.astroid_cache[BUILTINS] = self._builtins
+        super(BuiltinsSnapshotTest, self).tearDown()
+
+    def test_marker_keeps_identity(self):
+        self.assertIs(pickle.loads(pickle.dumps(raw_building._marker)),
+                      raw_building._marker)
+
+    def test_pickle_builtins(self):
+        data = disk_cache.dumps(raw_building._build_builtins())
+        self.assertIsNotNone(data)
+        astroid_builtin, generator_type = disk_cache.loads(data)
+        self.assertEqual(astroid_builtin.name, BUILTINS)
+        self.assertIs(generator_type.parent, astroid_builtin)
+        self.assertIsInstance(astroid_builtin['int'], nodes.ClassDef)
+        not_implemented = astroid_builtin['NotImplemented']
+        self.assertIs(not_implemented.value, NotImplemented)
+
+    def test_snapshot_written_and_read(self):
+        MANAGER.astroid_cache.pop(BUILTINS, None)
+        astroid_builtin, _ = raw_building._load_builtins()
+        self.assertEqual(os.listdir(self.cache_directory), ['builtins'])
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_directory, 'builtins'))), 1)
+        raw_building._BUILTINS_SNAPSHOT = None
+        MANAGER.astroid_cache.pop(BUILTINS, None)
+        loaded, _ = raw_building._load_builtins()
+        self.assertIsNot(loaded, astroid_builtin)
+        self.assertIs(MANAGER.astroid_cache[BUILTINS], loaded)
+        self.assertEqual(sorted(loaded.locals), sorted(astroid_builtin.locals))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -55,8 +55,10 @@ class NonRegressionTests(resources.AstroidCacheSetupMixin,
         # with other tests :
         manager.__dict__ = {}
         manager._failed_import_hooks = []
+        manager._clear_cache_hooks = []
         manager.astroid_cache = {}
         manager._mod_file_cache = {}
+        manager.retention_policies = {}
         manager._transform = transforms.TransformVisitor()
         manager.clear_cache() # trigger proper bootstraping
         return manager
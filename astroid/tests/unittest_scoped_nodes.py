@@ -243,6 +243,54 @@ class ModuleNodeTest(ModuleLoader, unittest.TestCase):
             with open(path, 'rb') as file_io:
                 self.assertEqual(stream.read(), file_io.read())
 
+    def test_node_at(self):
+        module = builder.parse('''
+            def func(arg):
+                result = arg + [
+                    1, 2]
+                return result; pass
+        ''')
+        function = module['func']
+        assign = function.body[0]
+        self.assertIs(module.node_at(2, 0), function)
+        self.assertIs(module.node_at(3, 4), assign.targets[0])
+        self.assertIs(module.node_at(3, 13), assign.value.left)
+        self.assertIs(module.node_at(4, 8), assign.value.right.elts[0])
+        self.assertIs(module.node_at(4, 11), assign.value.right.elts[1])
+        self.assertIs(module.node_at(5, 4), function.body[1])
+        self.assertIs(module.node_at(5, 24), function.body[2])
+        self.assertIs(module.node_at(3, 0), function)
+        self.assertIsNone(module.node_at(1, 0))
+        self.assertIsNone(module.node_at(7, 0))
+
+    def test_statements_in_range(self):
+        module = builder.parse('''
+            import os
+            def func(arg):
+                result = arg + [
+                    1, 2]
+                return result; pass
+            class Klass(object):
+                pass
+        ''')
+        function = module['func']
+        klass = module['Klass']
+        self.assertEqual(module.statements_in_range(4, 4),
+                         [function, function.body[0]])
+        self.assertEqual(module.statements_in_range(5, 7),
+                         [function] + function.body + [klass])
+        self.assertEqual(module.statements_in_range(1, 3),
+                         [module.body[0], function])
+        self.assertEqual(module.statements_in_range(9, 12), [])
+
+    def test_position_queries_match_walk(self):
+        module = resources.build_file('data/module.py', 'data.module')
+        nodes_ = module.node_index().nodes
+        for lineno in range(1, module.tolineno + 1):
+            statements = [node for node in nodes_ if node.is_statement
+                          and node.fromlineno <= lineno <= node.tolineno]
+            self.assertEqual(module.statements_in_range(lineno, lineno), statements)
+
 
 class FunctionNodeTest(ModuleLoader, unittest.TestCase):
 
@@ -23,6 +23,8 @@ import time
 import unittest
 
 from astroid import builder
+from astroid import context as contextmod
+from astroid import inference_tip
 from astroid import nodes
 from astroid import parse
 from astroid import transforms
@@ -240,6 +242,124 @@ class TestTransforms(unittest.TestCase):
                 import UserDict
         ''')
 
+    def test_only_candidates_are_transformed(self):
+        visited = []
+
+        def transform_name(node):
+            visited.append(node.name)
+            if node.name == 'b':
+                return nodes.const_factory(42)
+
+        self.transformer.register_transform(nodes.Name, transform_name)
+        module = parse('''
+            {a: b}
+            with b as x:
+                pass
+        ''', apply_transforms=False)
+        body = module.body
+        module = self.transformer.visit(module)
+        self.assertIs(module.body, body)
+        self.assertEqual(visited, ['a', 'b', 'b'])
+        self.assertIsInstance(module.body[0].value.items[0][1], nodes.Const)
+        self.assertIsInstance(module.body[1].items[0][0], nodes.Const)
+
+    def test_replaced_dict_key_looked_up(self):
+        def transform_const(node):
+            return nodes.const_factory('b')
+
+        self.transformer.register_transform(
+            nodes.Const, transform_const, lambda node: node.value == 'a')
+        module = parse('''
+            {'a': 1, 'c': 2}
+        ''', apply_transforms=False)
+        mapping = module.body[0].value
+        self.assertEqual(mapping.getitem('a').value, 1)
+        self.transformer.visit(module)
+        self.assertEqual(mapping.getitem('b').value, 1)
+        self.assertEqual(mapping.getitem('c').value, 2)
+        with self.assertRaises(IndexError):
+            mapping.getitem('a')
+
+    def test_transforms_are_applied_children_first(self):
+        visited = []
+
+        def transform_node(node):
+            visited.append(node.__class__.__name__)
+
+        for node_class in (nodes.Name, nodes.Call, nodes.FunctionDef, nodes.Module):
+            self.transformer.register_transform(node_class, transform_node)
+        self.parse_transform('''
+            def func():
+                f(a)
+            g()
+        ''')
+        self.assertEqual(visited, ['Name', 'Name', 'Call', 'FunctionDef',
+                                   'Name', 'Call', 'Module'])
+
+    def test_keyed_transforms(self):
+        called = []
+
+        def transform_call(node):
+            called.append(node.as_string())
+
+        def transform_module(node):
+            called.append(node.name)
+
+        self.transformer.register_transform(nodes.Call, transform_call,
+                                            key='namedtuple')
+        self.transformer.register_transform(nodes.Module, transform_module,
+                                            key='keyed')
+        module = parse('''
+            namedtuple('a', 'b')
+            collections.namedtuple('c', 'd')
+            tuple()
+        ''', module_name='keyed', apply_transforms=False)
+        self.transformer.visit(module)
+        self.assertEqual(called, ["namedtuple('a', 'b')",
+                                  "collections.namedtuple('c', 'd')",
+                                  'keyed'])
+
+        del called[:]
+        self.transformer.unregister_transform(nodes.Module, transform_module,
+                                              key='keyed')
+        self.transformer.visit(parse('pass', module_name='keyed'))
+        self.assertEqual(called, [])
+
+    def test_keyed_transforms_keep_registration_order(self):
+        called = []
+        self.transformer.register_transform(
+            nodes.Call, lambda node: called.append('first'))
+        self.transformer.register_transform(
+            nodes.Call, lambda node: called.append('second'), key='f')
+        self.transformer.register_transform(
+            nodes.Call, lambda node: called.append('third'))
+        self.parse_transform('f()')
+        self.assertEqual(called, ['first', 'second', 'third'])
+
+    def _count_inference_tip_calls(self, cached):
+        calls = []
+        def infer_call(node, context=None):
+            calls.append(node)
+            return iter([nodes.const_factory(42)])
+        self.transformer.register_transform(nodes.Call,
+                                            inference_tip(infer_call, cached=cached))
+        module = self.parse_transform('''
+        def test(): pass
+        test()
+        ''')
+        call = module.body[1].value
+        context = contextmod.InferenceContext()
+        for _ in range(2):
+            inferred = list(call.infer(context))
+            self.assertEqual(inferred[0].value, 42)
+        return len(calls)
+
+    def test_inference_tip_cached(self):
+        self.assertEqual(self._count_inference_tip_calls(cached=True), 1)
+
+    def test_inference_tip_not_cached(self):
+        self.assertEqual(self._count_inference_tip_calls(cached=False), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
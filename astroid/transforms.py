@@ -16,10 +16,66 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with astroid. If not, see <http://www.gnu.org/licenses/>.
 
+import bisect
 import collections
 import warnings
 
 
+def _replace_child(parent, child, new_child):
+    """Replace the given child of the node by another node"""
+    for field in parent._astroid_fields:
+        value = getattr(parent, field)
+        if value is child:
+            setattr(parent, field, new_child)
+            return
+        if not isinstance(value, list):
+            continue
+        for index, item in enumerate(value):
+            if item is child:
+                value[index] = new_child
+                return
+            if isinstance(item, tuple) and any(elt is child for elt in item):
+                value[index] = tuple(new_child if elt is child else elt
+                                     for elt in item)
+                # the items of a dictionary are indexed by key, see
+                # Dict._item_index
+                parent.__dict__.pop('_items_index', None)
+                return
+
+
+def _dispatch_key(node):
+    """Return the key used to find the keyed transforms of the given node
+
+    This is the name of the called function for a call, either a plain name
+    or the last attribute of a dotted name, and the name of the node for
+    the other nodes, such as the modules.
+    """
+    func = getattr(node, 'func', None)
+    if func is not None:
+        attrname = getattr(func, 'attrname', None)
+        if attrname is not None:
+            return attrname
+        node = func
+    return getattr(node, 'name', None)
+
+
+def _skip_subtrees(candidates, node_index, skip):
+    """Filter out the given candidate nodes lying in the subtrees of the
+    nodes to skip"""
+    spans = sorted(span for span in (node_index.span(node) for node in skip)
+                   if span is not None)
+    starts = [start for start, _ in spans]
+    positions = node_index.positions
+    kept = []
+    for node in candidates:
+        position = positions[node]
+        index = bisect.bisect_right(starts, position)
+        if index and position < spans[index - 1][1]:
+            continue
+        kept.append(node)
+    return kept
+
+
 class TransformVisitor(object):
     """A visitor for handling transforms.
 
@@ -31,20 +87,30 @@ class TransformVisitor(object):
 
     def __init__(self):
         self.transforms = collections.defaultdict(list)
+        # transforms registered with a key, by node class and then by key
+        self.keyed_transforms = collections.defaultdict(
+            lambda: collections.defaultdict(list))
+        # registration number of each transform, to run the keyed and the
+        # other transforms of a node in the order they were registered
+        self._sequences = collections.defaultdict(list)
+        self._registered = 0
+        # number of transforms applied so far, used to detect whether a
+        # tree may have been modified
+        self._applied = 0
 
     def _transform(self, node):
         """Call matching transforms for the given node if any and return the
         transformed node.
         """
-        cls = node.__class__
-        if cls not in self.transforms:
-            # no transform registered for this class of node
+        transforms = self._node_transforms(node)
+        if not transforms:
+            # no transform registered for this node
             return node
 
-        transforms = self.transforms[cls]
         orig_node = node  # copy the reference
         for transform_func, predicate in transforms:
             if predicate is None or predicate(node):
+                self._applied += 1
                 ret = transform_func(node)
                 # if the transformation function returns something, it's
                 # expected to be a replacement for the node
@@ -56,41 +122,139 @@ class TransformVisitor(object):
                     node = ret
         return node
 
+    def _node_transforms(self, node):
+        """Return the (transform, predicate) pairs to try on the given node"""
+        cls = node.__class__
+        transforms = self.transforms.get(cls)
+        keyed = self.keyed_transforms.get(cls)
+        if not keyed:
+            return transforms
+        matching = keyed.get(_dispatch_key(node))
+        if not matching:
+            return transforms
+        if not transforms:
+            return [(transform, predicate) for _, transform, predicate in matching]
+        merged = sorted(matching + [(sequence, transform, predicate)
+                                    for sequence, (transform, predicate)
+                                    in zip(self._sequences[cls], transforms)],
+                        key=lambda item: item[0])
+        return [(transform, predicate) for _, transform, predicate in merged]
+
     def _visit(self, node):
         if hasattr(node, '_astroid_fields'):
             for field in node._astroid_fields:
                 value = getattr(node, field)
                 visited = self._visit_generic(value)
-                setattr(node, field, visited)
+                if visited is not value:
+                    setattr(node, field, visited)
         return self._transform(node)
 
     def _visit_generic(self, node):
-        if isinstance(node, list):
-            return [self._visit_generic(child) for child in node]
-        elif isinstance(node, tuple):
-            return tuple(self._visit_generic(child) for child in node)
+        if isinstance(node, (list, tuple)):
+            visited = [self._visit_generic(child) for child in node]
+            if all(new is old for new, old in zip(visited, node)):
+                return node
+            if isinstance(node, tuple):
+                return tuple(visited)
+            return visited
         else:
             return self._visit(node)
 
-    def register_transform(self, node_class, transform, predicate=None):
+    def _visit_indexed(self, module, node_index, skip=()):
+        """Transform the candidate nodes found in the index of the module
+
+        Only the nodes of a class having transforms registered are visited,
+        children first as in the recursive walk. The subtrees of the nodes
+        given in *skip* aren't visited.
+        """
+        classes = [cls for cls in node_index.by_class if self.has_transforms(cls)]
+        candidates = node_index.postorder(classes)
+        if skip:
+            candidates = _skip_subtrees(candidates, node_index, skip)
+        result = module
+        for node in candidates:
+            applied = self._applied
+            transformed = self._transform(node)
+            if self._applied != applied:
+                # the tree may have changed, later queries shouldn't rely on
+                # the index, which is still good enough to find candidates
+                module.invalidate_node_index()
+            if transformed is node:
+                continue
+            parent = node_index.parent(node)
+            if parent is None:
+                result = transformed
+            else:
+                _replace_child(parent, node, transformed)
+        return result
+
+    def visit_children(self, node):
+        """Transform the children of the given node, but not the node itself
+
+        This is meant for the nodes added to a tree which was already
+        transformed.
+        """
+        for child in list(node.get_children()):
+            self.visit_children(child)
+            transformed = self._transform(child)
+            if transformed is not child:
+                _replace_child(node, child, transformed)
+
+    def has_transforms(self, node_class):
+        """return True if transforms are registered for the given node class"""
+        return bool(self.transforms.get(node_class)
+                    or self.keyed_transforms.get(node_class))
+
+    def register_transform(self, node_class, transform, predicate=None, key=None):
         """Register `transform(node)` function to be applied on the given
         astroid's `node_class` if `predicate` is None or returns true
         when called with the node as argument.
 
+        If `key` is given, the transform is only considered for the nodes
+        with this key: the name of the module for modules, the name of the
+        called function (or of its last attribute) for calls, and the name
+        of the node for the other named nodes. Looking up the transforms by
+        key is much cheaper than running a predicate on every node.
+
         The transform function may return a value which is then used to
         substitute the original node in the tree.
         """
-        self.transforms[node_class].append((transform, predicate))
+        self._registered += 1
+        if key is None:
+            self.transforms[node_class].append((transform, predicate))
+            self._sequences[node_class].append(self._registered)
+        else:
+            self.keyed_transforms[node_class][key].append(
+                (self._registered, transform, predicate))
 
-    def unregister_transform(self, node_class, transform, predicate=None):
+    def unregister_transform(self, node_class, transform, predicate=None, key=None):
         """Unregister the given transform."""
-        self.transforms[node_class].remove((transform, predicate))
+        if key is None:
+            index = self.transforms[node_class].index((transform, predicate))
+            del self.transforms[node_class][index]
+            del self._sequences[node_class][index]
+            return
+        transforms = self.keyed_transforms[node_class][key]
+        for index, (_, registered, registered_predicate) in enumerate(transforms):
+            if registered == transform and registered_predicate == predicate:
+                del transforms[index]
+                return
+        raise ValueError('%r is not registered' % (transform, ))
 
-    def visit(self, module):
+    def visit(self, module, skip=()):
         """Walk the given astroid *tree* and transform each encountered node
 
         Only the nodes which have transforms registered will actually
-        be replaced or changed.
+        be replaced or changed. The subtrees of the nodes of the module
+        given in *skip*, which were already transformed, are left alone.
         """
-        module.body = [self._visit(child) for child in module.body]
-        return self._transform(module)
+        applied = self._applied
+        get_node_index = getattr(module, 'node_index', None)
+        if get_node_index is not None:
+            result = self._visit_indexed(module, get_node_index(), skip)
+        else:
+            result = self._visit(module)
+        if self._applied != applied and hasattr(module, 'invalidate_node_index'):
+            # transforms may have modified the tree in place
+            module.invalidate_node_index()
+        return result
@@ -32,6 +32,14 @@ def reraise(exception):
     six.reraise(type(exception), exception, sys.exc_info()[2])
 
 
+def intern_name(name):
+    '''Return the interned version of the given name, if it is a string,
+    so that the equal names share the same string object.'''
+    if type(name) is str: # pylint: disable=unidiomatic-typecheck
+        return six.moves.intern(name)
+    return name
+
+
 @object.__new__
 class Uninferable(object):
     """Special inference object, which is returned when inference fails."""